@@ -40,6 +40,10 @@ ConcurrentDict_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
           args, kwds, "|n", kwlist, &initial_capacity)) {
     return NULL;
   }
+  if (initial_capacity < 1) {
+    PyErr_SetString(PyExc_ValueError, "initial_capacity must be at least 1");
+    return NULL;
+  }
 
   ConcurrentDictObject* self = (ConcurrentDictObject*)type->tp_alloc(type, 0);
   if (self != NULL) {
@@ -63,6 +67,18 @@ ConcurrentDict_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
   return (PyObject*)self;
 }
 
+/* Each bucket is an independent dict with its own lock so keys which hash to
+   different buckets never contend. The hash is treated as unsigned so negative
+   hashes need no special casing. */
+static inline PyObject* ConcurrentDict_bucket(
+    ConcurrentDictObject* self,
+    Py_hash_t hash) {
+  return self->buckets[(size_t)hash % (size_t)self->size];
+}
+
+/* There is no per key type specialization here on purpose: each bucket is a
+   plain dict which already switches to its str only lookup while it holds
+   only str keys, and str and int hashes are cached or trivial. */
 static PyObject* ConcurrentDict_getitem(
     ConcurrentDictObject* self,
     PyObject* key) {
@@ -71,18 +87,12 @@ static PyObject* ConcurrentDict_getitem(
     return NULL;
   }
 
-  Py_ssize_t index = hash % self->size;
-  if (index < 0) {
-    index = -index;
-  }
-
-  PyObject* value = PyDict_GetItem(self->buckets[index], key);
-  if (!value) {
+  PyObject* value;
+  int found =
+      PyDict_GetItemRef(ConcurrentDict_bucket(self, hash), key, &value);
+  if (found == 0) {
     PyErr_SetObject(PyExc_KeyError, key);
-    return NULL;
   }
-
-  Py_INCREF(value);
   return value;
 }
 
@@ -95,17 +105,13 @@ static int ConcurrentDict_setitem(
     return -1;
   }
 
-  Py_ssize_t index = hash % self->size;
-  if (index < 0) {
-    index = -index;
-  }
-
+  PyObject* bucket = ConcurrentDict_bucket(self, hash);
   if (value == NULL) {
-    if (PyDict_DelItem(self->buckets[index], key) < 0) {
+    if (PyDict_DelItem(bucket, key) < 0) {
       return -1;
     }
   } else {
-    if (PyDict_SetItem(self->buckets[index], key, value) < 0) {
+    if (PyDict_SetItem(bucket, key, value) < 0) {
       return -1;
     }
   }
@@ -118,18 +124,56 @@ static int ConcurrentDict_contains(ConcurrentDictObject* self, PyObject* key) {
     return -1;
   }
 
-  Py_ssize_t index = hash % self->size;
-  if (index < 0) {
-    index = -index;
+  /* PyDict_Contains never produces the value, so membership tests cause no
+     reference count traffic on (possibly shared, hot) values. */
+  return PyDict_Contains(ConcurrentDict_bucket(self, hash), key);
+}
+
+static PyObject* ConcurrentDict_pop(
+    ConcurrentDictObject* self,
+    PyObject* args) {
+  PyObject* key;
+  PyObject* default_value = NULL;
+  if (!PyArg_ParseTuple(args, "O|O", &key, &default_value)) {
+    return NULL;
+  }
+
+  Py_hash_t hash = PyObject_Hash(key);
+  if (hash == -1 && PyErr_Occurred()) {
+    return NULL;
   }
 
-  return PyDict_Contains(self->buckets[index], key);
+  /* The lookup and removal happen under the bucket's lock so exactly one of
+     any number of concurrent pops of the same key gets the value. */
+  PyObject* value;
+  int found = PyDict_Pop(ConcurrentDict_bucket(self, hash), key, &value);
+  if (found < 0) {
+    return NULL;
+  }
+  if (found == 0) {
+    if (default_value == NULL) {
+      PyErr_SetObject(PyExc_KeyError, key);
+      return NULL;
+    }
+    return Py_NewRef(default_value);
+  }
+  return value;
+}
+
+static Py_ssize_t ConcurrentDict_len(ConcurrentDictObject* self) {
+  Py_ssize_t len = 0;
+  for (Py_ssize_t i = 0; i < self->size; i++) {
+    len += PyDict_Size(self->buckets[i]);
+  }
+  return len;
 }
 
 static PyObject* ConcurrentDict_as_dict(
     ConcurrentDictObject* self,
     PyObject* Py_UNUSED(args)) {
-  PyObject* dict = PyDict_New();
+  /* Presize from the current total so merging the buckets does not resize the
+     result repeatedly. Concurrent inserts only make this a hint. */
+  PyObject* dict = _PyDict_NewPresized(ConcurrentDict_len(self));
   if (!dict) {
     return NULL;
   }
@@ -144,6 +188,130 @@ static PyObject* ConcurrentDict_as_dict(
   return dict;
 }
 
+static int ConcurrentDict_update_from_dict(
+    ConcurrentDictObject* self,
+    PyObject* dict) {
+  int err = 0;
+  Py_BEGIN_CRITICAL_SECTION(dict);
+  Py_ssize_t pos = 0;
+  PyObject* key;
+  PyObject* value;
+  while (PyDict_Next(dict, &pos, &key, &value)) {
+    Py_INCREF(key);
+    Py_INCREF(value);
+    err = ConcurrentDict_setitem(self, key, value);
+    Py_DECREF(key);
+    Py_DECREF(value);
+    if (err < 0) {
+      break;
+    }
+  }
+  Py_END_CRITICAL_SECTION();
+  return err;
+}
+
+static int ConcurrentDict_update_from_pairs(
+    ConcurrentDictObject* self,
+    PyObject* iterable) {
+  PyObject* iter = PyObject_GetIter(iterable);
+  if (!iter) {
+    return -1;
+  }
+  PyObject* item;
+  while ((item = PyIter_Next(iter))) {
+    PyObject* pair = PySequence_Fast(
+        item, "cannot convert update sequence element to a sequence");
+    Py_DECREF(item);
+    if (!pair) {
+      Py_DECREF(iter);
+      return -1;
+    }
+    if (PySequence_Fast_GET_SIZE(pair) != 2) {
+      PyErr_Format(
+          PyExc_ValueError,
+          "update sequence element has length %zd; 2 is required",
+          PySequence_Fast_GET_SIZE(pair));
+      Py_DECREF(pair);
+      Py_DECREF(iter);
+      return -1;
+    }
+    int err = ConcurrentDict_setitem(
+        self,
+        PySequence_Fast_GET_ITEM(pair, 0),
+        PySequence_Fast_GET_ITEM(pair, 1));
+    Py_DECREF(pair);
+    if (err < 0) {
+      Py_DECREF(iter);
+      return -1;
+    }
+  }
+  Py_DECREF(iter);
+  return PyErr_Occurred() ? -1 : 0;
+}
+
+static PyTypeObject ConcurrentDictType;
+
+/* Bulk insert from a dict, another ConcurrentDict, a mapping or an iterable of
+   key value pairs. This is a single call from Python and so avoids the per item
+   dispatch overhead of repeated d[k] = v. It is not atomic; each pair is
+   inserted independently. */
+static PyObject* ConcurrentDict_update(
+    ConcurrentDictObject* self,
+    PyObject* other) {
+  int err;
+  if (PyDict_Check(other)) {
+    err = ConcurrentDict_update_from_dict(self, other);
+  } else if (PyObject_TypeCheck(other, &ConcurrentDictType)) {
+    ConcurrentDictObject* source = (ConcurrentDictObject*)other;
+    err = 0;
+    for (Py_ssize_t i = 0; i < source->size && err == 0; i++) {
+      err = ConcurrentDict_update_from_dict(self, source->buckets[i]);
+    }
+  } else if (PyObject_HasAttrString(other, "keys")) {
+    PyObject* items = PyMapping_Items(other);
+    if (!items) {
+      return NULL;
+    }
+    err = ConcurrentDict_update_from_pairs(self, items);
+    Py_DECREF(items);
+  } else {
+    err = ConcurrentDict_update_from_pairs(self, other);
+  }
+  if (err < 0) {
+    return NULL;
+  }
+  Py_RETURN_NONE;
+}
+
+/* Bulk lookup; one call from Python for many keys. Like update this is not
+   atomic across keys, each lookup is independent. */
+static PyObject* ConcurrentDict_get_many(
+    ConcurrentDictObject* self,
+    PyObject* keys) {
+  PyObject* seq = PySequence_Fast(keys, "get_many() argument must be iterable");
+  if (!seq) {
+    return NULL;
+  }
+  Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+  PyObject* result = PyTuple_New(n);
+  if (!result) {
+    Py_DECREF(seq);
+    return NULL;
+  }
+  for (Py_ssize_t i = 0; i < n; i++) {
+    PyObject* value =
+        ConcurrentDict_getitem(self, PySequence_Fast_GET_ITEM(seq, i));
+    if (!value) {
+      Py_DECREF(result);
+      Py_DECREF(seq);
+      return NULL;
+    }
+    PyTuple_SET_ITEM(result, i, value);
+  }
+  Py_DECREF(seq);
+  return result;
+}
+
 static int ConcurrentDict_traverse(
     ConcurrentDictObject* self,
     visitproc visit,
@@ -156,7 +324,7 @@ static int ConcurrentDict_traverse(
 }
 
 static PyMappingMethods ConcurrentDict_mapping = {
-    (lenfunc)0, // mp_length
+    (lenfunc)ConcurrentDict_len, // mp_length
     (binaryfunc)ConcurrentDict_getitem, // mp_subscript
     (objobjargproc)ConcurrentDict_setitem, // mp_ass_subscript
 };
@@ -171,6 +339,21 @@ static PyMethodDef ConcurrentDict_methods[] = {
      METH_NOARGS,
      PyDoc_STR(
          "Create a dict from the key value pairs in this ConcurrentDict. Not thread consistent.")},
+    {"pop",
+     (PyCFunction)ConcurrentDict_pop,
+     METH_VARARGS,
+     PyDoc_STR(
+         "Atomically remove a key and return its value, or default if given and the key is missing.")},
+    {"update",
+     (PyCFunction)ConcurrentDict_update,
+     METH_O,
+     PyDoc_STR(
+         "Insert the key value pairs from a mapping or an iterable of pairs. Not atomic.")},
+    {"get_many",
+     (PyCFunction)ConcurrentDict_get_many,
+     METH_O,
+     PyDoc_STR(
+         "Return a tuple of the values for an iterable of keys. Not atomic.")},
     {NULL, NULL, 0, NULL}};
 
 static PyTypeObject ConcurrentDictType = {
@@ -197,9 +380,15 @@ static PyTypeObject ConcurrentDictType = {
  *******************
  */
 
+/* The value is kept a whole cache line away from the object header on one
+   side and padded to a whole line on the other. Threads sharing an atomic
+   bump its (shared) reference count on every method call, and without the
+   leading pad those header writes would evict the line holding the value. */
 typedef struct {
-  PyObject_HEAD int64_t value;
-  PyObject* weakreflist;
+  PyObject_HEAD PyObject* weakreflist;
+  char _head_pad[FT_CACHE_LINE_SIZE - sizeof(PyObject*)];
+  int64_t value;
+  char _pad[FT_CACHE_LINE_SIZE - sizeof(int64_t)];
 } AtomicInt64Object;
 
 static PyTypeObject AtomicInt64Type;
@@ -233,11 +422,26 @@ static void atomicint64_dealloc(AtomicInt64Object* self) {
   Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
+/* Small ints are stored compactly from 3.12 and can be read without the
+   general PyLong_AsLongLong conversion. */
+static inline int atomicint64_long_value(PyObject* other, int64_t* value) {
+#if PY_VERSION_HEX >= 0x030C0000
+  if (PyUnstable_Long_IsCompact((PyLongObject*)other)) {
+    *value = PyUnstable_Long_CompactValue((PyLongObject*)other);
+    return 0;
+  }
+#endif
+  *value = PyLong_AsLongLong(other);
+  return (*value == -1 && PyErr_Occurred()) ? -1 : 0;
+}
+
 #define GET_I64_OR_ERROR(other)                                           \
   int64_t value;                                                          \
   do {                                                                    \
     if (PyLong_CheckExact(other)) {                                       \
-      value = PyLong_AsLongLong(other);                                   \
+      if (atomicint64_long_value(other, &value) < 0) {                    \
+        return NULL;                                                      \
+      }                                                                   \
     } else if (PyObject_TypeCheck(other, &AtomicInt64Type)) {             \
       value = _Py_atomic_load_int64(&((AtomicInt64Object*)other)->value); \
     } else {                                                              \
@@ -304,7 +508,9 @@ static PyObject* atomicint64_idiv(AtomicInt64Object* self, PyObject* other) {
 }
 
 static int atomicint64_bool(AtomicInt64Object* self) {
-  return _Py_atomic_load_int64(&self->value) != 0;
+  /* Truth tests are mostly polled in wait loops (e.g. AtomicFlag) so an acquire
+     load is enough; there is no need for a sequentially consistent read. */
+  return _Py_atomic_load_uint64_acquire((uint64_t*)&self->value) != 0;
 }
 
 static PyObject* atomicint64_int(AtomicInt64Object* self) {
@@ -327,19 +533,59 @@ static PyObject* atomicint64_abs(AtomicInt64Object* self) {
   return PyLong_FromLongLong(value);
 }
 
-static PyObject* atomicint64_format(AtomicInt64Object* self, PyObject* args) {
-  PyObject* int_obj = atomicint64_int(self);
-  if (int_obj == NULL)
-    return NULL;
+/* Render value in the given base straight into a stack buffer; this avoids
+   creating a throwaway PyLong for the common single character format specs. */
+static PyObject* atomicint64_format_base(
+    int64_t value,
+    unsigned int base,
+    const char* digits) {
+  char buf[66]; /* Sign plus 64 binary digits, no terminator needed. */
+  char* end = buf + sizeof(buf);
+  char* p = end;
+  uint64_t magnitude =
+      value < 0 ? (uint64_t)0 - (uint64_t)value : (uint64_t)value;
+  do {
+    *--p = digits[magnitude % base];
+    magnitude /= base;
+  } while (magnitude);
+  if (value < 0) {
+    *--p = '-';
+  }
+  return PyUnicode_FromStringAndSize(p, end - p);
+}
 
+static PyObject* atomicint64_format(AtomicInt64Object* self, PyObject* args) {
   PyObject* format_spec;
   if (!PyArg_ParseTuple(args, "O", &format_spec))
     return NULL;
-  Py_INCREF(format_spec);
+
+  if (PyUnicode_Check(format_spec) && PyUnicode_GET_LENGTH(format_spec) <= 1) {
+    int64_t value = _Py_atomic_load_int64(&self->value);
+    Py_UCS4 type = PyUnicode_GET_LENGTH(format_spec)
+        ? PyUnicode_READ_CHAR(format_spec, 0)
+        : 'd';
+    switch (type) {
+      case 'd':
+        return atomicint64_format_base(value, 10, "0123456789");
+      case 'x':
+        return atomicint64_format_base(value, 16, "0123456789abcdef");
+      case 'X':
+        return atomicint64_format_base(value, 16, "0123456789ABCDEF");
+      case 'o':
+        return atomicint64_format_base(value, 8, "01234567");
+      case 'b':
+        return atomicint64_format_base(value, 2, "01");
+      default:
+        break;
+    }
+  }
+
+  PyObject* int_obj = atomicint64_int(self);
+  if (int_obj == NULL)
+    return NULL;
 
   PyObject* result = PyObject_Format(int_obj, format_spec);
   Py_DECREF(int_obj);
-  Py_DECREF(format_spec);
 
   return result;
 }
@@ -405,12 +651,22 @@ static PyObject* atomicint64_not(AtomicInt64Object* self) {
   return PyLong_FromLongLong(~_Py_atomic_load_int64(&self->value));
 }
 
+/* get and set stay sequentially consistent: callers such as ConcurrentQueue
+   pair an increment on one counter with a get of another (store then load),
+   which acquire/release alone does not order. */
 static PyObject* atomicint64_set(AtomicInt64Object* self, PyObject* other) {
   GET_I64_OR_ERROR(other);
   _Py_atomic_store_int64(&self->value, value);
   Py_RETURN_NONE;
 }
 
+static PyObject* atomicint64_exchange(
+    AtomicInt64Object* self,
+    PyObject* other) {
+  GET_I64_OR_ERROR(other);
+  return PyLong_FromLongLong(_Py_atomic_exchange_int64(&self->value, value));
+}
+
 static PyObject* atomicint64_get(AtomicInt64Object* self) {
   return PyLong_FromLongLong(_Py_atomic_load_int64(&self->value));
 }
@@ -423,12 +679,40 @@ static PyObject* atomicint64_decr(AtomicInt64Object* self) {
   return PyLong_FromLongLong(_Py_atomic_add_int64(&self->value, -1) - 1);
 }
 
+static PyObject* atomicint64_incr_by(
+    AtomicInt64Object* self,
+    PyObject* other) {
+  GET_I64_OR_ERROR(other);
+  _Py_atomic_add_int64(&self->value, value);
+  Py_RETURN_NONE;
+}
+
+static PyObject* atomicint64_decr_by(
+    AtomicInt64Object* self,
+    PyObject* other) {
+  GET_I64_OR_ERROR(other);
+  atomic_int64_sub(&self->value, value);
+  Py_RETURN_NONE;
+}
+
+static PyObject* atomicint64_incr_relaxed(AtomicInt64Object* self) {
+  return PyLong_FromLongLong(atomic_int64_add_relaxed(&self->value, 1) + 1);
+}
+
+static PyObject* atomicint64_decr_relaxed(AtomicInt64Object* self) {
+  return PyLong_FromLongLong(atomic_int64_add_relaxed(&self->value, -1) - 1);
+}
+
 static PyMethodDef atomicint64_methods[] = {
     {"set", (PyCFunction)atomicint64_set, METH_O, "Atomically set the value"},
     {"get",
      (PyCFunction)atomicint64_get,
      METH_NOARGS,
      "Atomically get the value"},
+    {"exchange",
+     (PyCFunction)atomicint64_exchange,
+     METH_O,
+     "Atomically set the value and return the previous value"},
     {"incr",
      (PyCFunction)atomicint64_incr,
      METH_NOARGS,
@@ -437,6 +721,22 @@ static PyMethodDef atomicint64_methods[] = {
      (PyCFunction)atomicint64_decr,
      METH_NOARGS,
      "Atomically -- and return new value"},
+    {"incr_by",
+     (PyCFunction)atomicint64_incr_by,
+     METH_O,
+     "Atomically += n without creating a result"},
+    {"decr_by",
+     (PyCFunction)atomicint64_decr_by,
+     METH_O,
+     "Atomically -= n without creating a result"},
+    {"incr_relaxed",
+     (PyCFunction)atomicint64_incr_relaxed,
+     METH_NOARGS,
+     "Atomically ++ with relaxed memory ordering and return new value"},
+    {"decr_relaxed",
+     (PyCFunction)atomicint64_decr_relaxed,
+     METH_NOARGS,
+     "Atomically -- with relaxed memory ordering and return new value"},
     {"__format__",
      (PyCFunction)atomicint64_format,
      METH_VARARGS,
@@ -489,9 +789,12 @@ static PyTypeObject AtomicInt64Type = {
  ***********************
  */
 
+/* Padded like AtomicInt64Object. */
 typedef struct {
-  PyObject_HEAD PyObject* ref;
-  PyObject* weakreflist;
+  PyObject_HEAD PyObject* weakreflist;
+  char _head_pad[FT_CACHE_LINE_SIZE - sizeof(PyObject*)];
+  PyObject* ref;
+  char _pad[FT_CACHE_LINE_SIZE - sizeof(PyObject*)];
 } AtomicReferenceObject;
 
 static PyObject*
@@ -535,10 +838,17 @@ static int atomicreference_traverse(
     AtomicReferenceObject* self,
     visitproc visit,
     void* arg) {
-  Py_VISIT(_Py_atomic_load_ptr(&self->ref));
+  /* Traversal runs with the world stopped (or under the GIL) so no writer can
+     race this load and there is no need to pay for a sequentially consistent
+     one. */
+  Py_VISIT(_Py_atomic_load_ptr_relaxed(&self->ref));
   return 0;
 }
 
+/* Readers never lock. ConcurrentGetNewReference loads the pointer, tries to
+   incref the object only if the slot still holds it and retries otherwise, which
+   is the validate step of a seqlock without the writer ever blocking readers.
+   Writers are a single atomic exchange. */
 static PyObject* atomicreference_get(AtomicReferenceObject* self) {
   return ConcurrentGetNewReference(&self->ref);
 }
@@ -569,6 +879,13 @@ static PyObject* atomicreference_compare_exchange(
   if (!PyArg_ParseTuple(args, "OO", &expected, &obj)) {
     return NULL;
   }
+  /* Compare then compare and swap; a CAS which is going to fail still takes the
+     cache line exclusively so check with an acquire load first. Acquire pairs
+     with the release of the writer which stored the value we compare against,
+     so a failed check reflects a published store rather than a stale one. */
+  if (_Py_atomic_load_ptr_acquire(&self->ref) != expected) {
+    Py_RETURN_FALSE;
+  }
   ConcurrentRegisterReference(obj);
   Py_INCREF(obj);
   if (!_Py_atomic_compare_exchange_ptr(&self->ref, &expected, obj)) {
@@ -580,12 +897,22 @@ static PyObject* atomicreference_compare_exchange(
 }
 
 static PyMethodDef AtomicReference_methods[] = {
-    {"set", (PyCFunction)atomicreference_set, METH_O},
-    {"get", (PyCFunction)atomicreference_get, METH_NOARGS},
-    {"exchange", (PyCFunction)atomicreference_exchange, METH_O},
+    {"set",
+     (PyCFunction)atomicreference_set,
+     METH_O,
+     "Atomically set the reference"},
+    {"get",
+     (PyCFunction)atomicreference_get,
+     METH_NOARGS,
+     "Atomically get the reference"},
+    {"exchange",
+     (PyCFunction)atomicreference_exchange,
+     METH_O,
+     "Atomically set the reference and return the previous one"},
     {"compare_exchange",
      (PyCFunction)atomicreference_compare_exchange,
-     METH_VARARGS},
+     METH_VARARGS,
+     "Atomically set the reference if it is expected; return True on success"},
     {NULL}};
 
 static PyTypeObject AtomicReferenceType = {
@@ -1862,6 +2189,12 @@ done:
 */
 
 static int exec_local_module(PyObject* module) {
+  Py_BUILD_ASSERT(
+      offsetof(AtomicInt64Object, value) >=
+      sizeof(PyObject) + FT_CACHE_LINE_SIZE);
+  Py_BUILD_ASSERT(
+      offsetof(AtomicReferenceObject, ref) >=
+      sizeof(PyObject) + FT_CACHE_LINE_SIZE);
   if (PyType_Ready(&ConcurrentDictType) < 0) {
     return -1;
   }
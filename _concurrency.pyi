@@ -2,7 +2,16 @@
 
 # pyre-strict
 
-from typing import Generic, Iterator, Optional, Sequence, TypeVar
+from typing import (
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    overload,
+    Sequence,
+    TypeVar,
+)
 
 K = TypeVar("K")
 V = TypeVar("V")
@@ -12,7 +21,17 @@ class ConcurrentDict(Generic[K, V]):
     def __contains__(self, key: K) -> bool: ...
     def __setitem__(self, key: K, value: V) -> None: ...
     def __getitem__(self, key: V) -> Optional[V]: ...
+    def __len__(self) -> int: ...
+    @overload
+    def pop(self, key: K) -> V: ...
+    @overload
+    def pop(self, key: K, default: V) -> V: ...
     def as_dict(self) -> dict[K, V]: ...
+    def update(
+        self,
+        other: "Mapping[K, V] | ConcurrentDict[K, V] | Iterable[tuple[K, V]]",
+    ) -> None: ...
+    def get_many(self, keys: Iterable[K]) -> tuple[V, ...]: ...
 
 E = TypeVar("E")
 
@@ -37,8 +56,13 @@ class AtomicInt64:
     def __init__(self, value: int = ...) -> None: ...
     def set(self, value: int) -> None: ...
     def get(self) -> int: ...
+    def exchange(self, value: int) -> int: ...
     def incr(self) -> int: ...
     def decr(self) -> int: ...
+    def incr_by(self, value: int | AtomicInt64) -> None: ...
+    def decr_by(self, value: int | AtomicInt64) -> None: ...
+    def incr_relaxed(self) -> int: ...
+    def decr_relaxed(self) -> int: ...
     def __format__(self, format_spec: str) -> str: ...
     def __add__(self, other: object) -> int: ...
     def __sub__(self, other: object) -> int: ...
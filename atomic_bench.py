@@ -6,7 +6,7 @@ import threading
 from typing import Any, Optional
 
 from ft_utils.benchmark_utils import BenchmarkProvider, execute_benchmarks, ft_randint
-from ft_utils.concurrency import AtomicReference
+from ft_utils.concurrency import AtomicInt64, AtomicReference
 from ft_utils.local import LocalWrapper
 
 
@@ -42,6 +42,8 @@ class ReferenceBenchmarkProvider(BenchmarkProvider):
         self._operations = operations
         self._atomic_ref = AtomicReference(1)  # pyre-fixme[4]
         self._locked_ref = LockedReference(1)
+        # Shared by every benchmark thread so the counter benchmarks measure contention.
+        self._atomic_int = AtomicInt64(0)
 
     def benchmark_atomic_set(self) -> None:
         ref = LocalWrapper(self._atomic_ref)
@@ -71,6 +73,26 @@ class ReferenceBenchmarkProvider(BenchmarkProvider):
             else:
                 _ = ref.get()
 
+    def benchmark_atomic_incr(self) -> None:
+        ai = LocalWrapper(self._atomic_int)
+        for _ in range(self._operations):
+            ai.incr()
+
+    def benchmark_atomic_incr_relaxed(self) -> None:
+        ai = LocalWrapper(self._atomic_int)
+        for _ in range(self._operations):
+            ai.incr_relaxed()
+
+    def benchmark_atomic_incr_by(self) -> None:
+        ai = LocalWrapper(self._atomic_int)
+        for _ in range(self._operations):
+            ai.incr_by(1)
+
+    def benchmark_atomic_iadd(self) -> None:
+        ai = LocalWrapper(self._atomic_int)
+        for _ in range(self._operations):
+            ai += 1
+
     def benchmark_locked_set(self) -> None:
         ref = LocalWrapper(self._locked_ref)
         for i in range(self._operations):
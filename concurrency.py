@@ -29,6 +29,8 @@ from ft_utils.local import LocalWrapper
 
 
 class AtomicFlag:
+    __slots__ = ("_int64", "__weakref__")
+
     def __init__(self, value: bool) -> None:
         self._int64 = AtomicInt64(-1 if value else 0)
 
@@ -36,8 +38,44 @@ class AtomicFlag:
         self._int64.set(-1 if value else 0)
 
     def __bool__(self) -> bool:
+        # A plain (acquire) load; waiters spinning on the flag never take the
+        # cache line exclusively.
         return bool(self._int64)
 
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until the flag is set or the timeout expires.
+
+        Rather than burning a core spinning on the flag, the waiter yields and then backs off
+        exponentially up to 50ms between checks. set() is unaffected, it never has to wake anyone.
+
+        Args:
+            timeout (float | None, optional): The maximum time to wait in seconds. Defaults to None, ie forever.
+        Returns:
+            bool: True if the flag is set, False if the timeout expired first.
+        """
+        _int64 = LocalWrapper(self._int64)
+        if _int64:
+            return True
+        _sleep = LocalWrapper(time.sleep)
+        _now = LocalWrapper(time.monotonic)
+        start = _now()
+        end_time = None if timeout is None else start + timeout
+        pause_time = start + 0.001
+        backoff = 0.0005
+        while not _int64:
+            it_now = _now()
+            if end_time is not None and it_now >= end_time:
+                return False
+            if it_now > pause_time:
+                backoff = min(backoff * 2, 0.05)
+                if end_time is not None:
+                    backoff = min(backoff, end_time - it_now)
+                _sleep(backoff)
+            else:
+                _sleep(0)
+        return True
+
 
 class ConcurrentGatheringIterator:
     """
@@ -55,12 +93,20 @@ class ConcurrentGatheringIterator:
     scaling (Optional(int)): expected number of threads or cores accessing the structure.
     """
 
+    __slots__ = ("_dict", "_cond", "_waiting", "_failed", "__weakref__")
+
     def __init__(self, scaling: int | None = None) -> None:
+        # The keys are dense ints and ints hash to themselves, so consecutive keys land in
+        # consecutive shards of the ConcurrentDict round robin. That already gives the striping
+        # of an atomic array without needing to know max_key (and so the capacity) up front.
         if scaling is not None:
             self._dict: ConcurrentDict[int, object] = ConcurrentDict(scaling)
         else:
             self._dict: ConcurrentDict[int, object] = ConcurrentDict()
         self._cond = threading.Condition()
+        # Number of readers blocked on the condition; inserts only take the condition's lock
+        # to notify when somebody is actually waiting.
+        self._waiting = AtomicInt64(0)
         # We probably don't need an atomic flag but it
         # it is safe and clear to use one here.
         self._failed = AtomicFlag(False)
@@ -77,8 +123,12 @@ class ConcurrentGatheringIterator:
             self._dict[key] = value
         except:
             self._failed.set(True)
+            with self._cond:
+                self._cond.notify_all()
             raise
-        finally:
+        # A reader which misses this (it registers just after the check) still wakes on its
+        # wait timeout, so skipping the lock when nobody is waiting is safe.
+        if self._waiting:
             with self._cond:
                 self._cond.notify_all()
 
@@ -99,23 +149,28 @@ class ConcurrentGatheringIterator:
         _dict = LocalWrapper(self._dict)
         _cond = LocalWrapper(self._cond)
         _failed = LocalWrapper(self._failed)
+        _waiting = LocalWrapper(self._waiting)
+        # With clear each value is taken with a single pop rather than a lookup and a delete.
+        _take = _dict.pop if clear else _dict.__getitem__
         while key <= max_key:
             try:
-                value = _dict[key]
+                value = _take(key)
             except KeyError:
                 # We check the key in the dict then wait - which efficient but could result
                 # in the key being added before we wait. That would mean the notify would be
                 # called before the wait and so we miss it. Setting a timeout on the wait
                 # fixes this with introducing strict interlocking between producer and consumer
                 # (which is the very thing we are trying to avoid).
-                with _cond:
-                    while key not in _dict:
-                        self._cond.wait(0.01)
-                        if _failed:
-                            raise RuntimeError("Iterator insertion failed")
-                value = _dict[key]
-            if clear:
-                del _dict[key]
+                _waiting.incr()
+                try:
+                    with _cond:
+                        while key not in _dict:
+                            _cond.wait(0.01)
+                            if _failed:
+                                raise RuntimeError("Iterator insertion failed")
+                finally:
+                    _waiting.decr()
+                value = _take(key)
             yield value
             key += 1
 
@@ -132,6 +187,17 @@ class ConcurrentQueue:
         for queue.Queue use StdConcurrentQueue.
     """
 
+    __slots__ = (
+        "_dict",
+        "_flags",
+        "_inkey",
+        "_outkey",
+        "_wakeups",
+        "_waiters",
+        "_lock_free",
+        "__weakref__",
+    )
+
     _SHUTDOWN = 1
     _FAILED = 2
     _SHUT_NOW = 4
@@ -147,10 +213,15 @@ class ConcurrentQueue:
             self._dict: ConcurrentDict[int, object] = ConcurrentDict(scaling)
         else:
             self._dict: ConcurrentDict[int, object] = ConcurrentDict()
-        self._cond = threading.Condition()
         self._flags = AtomicInt64(0)
         self._inkey = AtomicInt64(0)
         self._outkey = AtomicInt64(0)
+        # Each blocked pop waits on its own event, registered against the key it is waiting for,
+        # so a push wakes exactly the one pop which can take its value rather than every waiter.
+        self._wakeups: ConcurrentDict[int, threading.Event] = ConcurrentDict()
+        # Number of pops blocked (or about to block); pushes skip looking for an event to set when
+        # there is nobody to wake.
+        self._waiters = AtomicInt64(0)
         self._lock_free = lock_free
 
     def push(self, value: Any) -> None:  # type: ignore
@@ -164,15 +235,33 @@ class ConcurrentQueue:
         """
         if self._flags & self._SHUTDOWN:
             raise ShutDown
+        key = self._inkey.incr()
         try:
-            self._dict[self._inkey.incr()] = value
+            self._dict[key] = value
         except:
             self._flags |= self._FAILED
-            raise
-        finally:
             if not self._lock_free:
-                with self._cond:
-                    self._cond.notify_all()
+                self._wake_all()
+            raise
+        # AtomicInt64 incr and get are sequentially consistent. We increment the in key and then
+        # read the waiter count; a pop publishes its event, increments the waiter count and then
+        # re-reads the in key. In the single order of those operations either our read sees its
+        # increment, and so its event is already in _wakeups, or its read of the in key sees our
+        # key and it does not block.
+        if not self._lock_free and self._waiters.get():
+            try:
+                event = self._wakeups[key]
+            except KeyError:
+                return
+            event.set()
+
+    def _wake_all(self) -> None:
+        # Called after setting a flag. Setting flags is not sequentially consistent, so order it
+        # against pops with a read-modify-write of the waiter count: a pop whose increment came
+        # first has its event in _wakeups, and one whose increment came later sees the flag.
+        self._waiters.incr_by(0)
+        for event in self._wakeups.as_dict().values():
+            event.set()
 
     def size(self) -> int:
         """
@@ -206,8 +295,7 @@ class ConcurrentQueue:
         # If any pop is waiting then by definition the queue is empty so we need to let the pop waiters
         # wake up and exit.
         if not self._lock_free:
-            with self._cond:
-                self._cond.notify_all()
+            self._wake_all()
 
     def pop(self, timeout: float | None = None) -> Any:  # type: ignore
         """
@@ -252,15 +340,17 @@ class ConcurrentQueue:
                     end_time = start + timeout
                 else:
                     end_time = None
-                # Yield for the first 50ms then start pausing 50ms per iteration
-                # after that. Maybe we could make this configurable but that could just
-                # cause confusion whilst this is a good value for most cases.
+                # Yield for the first 50ms then back off exponentially, doubling the pause
+                # from 1ms up to 50ms per iteration. Maybe we could make this configurable
+                # but that could just cause confusion whilst this is a good value for most cases.
                 pause_time = start + 0.05
+                backoff = 0.0005
 
                 while _in_key < next_key:
                     it_now = _now()
                     if it_now > pause_time:
-                        _sleep(0.05)
+                        backoff = min(backoff * 2, 0.05)
+                        _sleep(backoff)
                     else:
                         _sleep(0)
                     if _flags & _shutdown:
@@ -271,19 +361,32 @@ class ConcurrentQueue:
                         self._add_placeholder(next_key)
                         raise Empty
             else:
-                _cond = LocalWrapper(self._cond)
+                _waiters = LocalWrapper(self._waiters)
+                _wakeups = LocalWrapper(self._wakeups)
+                event = threading.Event()
                 timed_out = False
-                with _cond:
+                end_time = None if timeout is None else start + timeout
+                # Publish the event before counting ourselves as a waiter, then re-check the in key
+                # and flags; see push and _wake_all for why a wake up cannot be missed.
+                _wakeups[next_key] = event
+                _waiters.incr()
+                try:
                     while _in_key < next_key:
                         if _flags & _shutdown:
                             raise ShutDown
                         if _flags & _failed:
                             raise RuntimeError("Queue failed")
-                        if timeout is None:
-                            _cond.wait()
-                        elif timeout == 0.0 or not _cond.wait(timeout):
-                            timed_out = True
-                            break
+                        if end_time is None:
+                            event.wait()
+                        else:
+                            remaining = end_time - _now()
+                            if remaining <= 0.0:
+                                timed_out = True
+                                break
+                            event.wait(remaining)
+                finally:
+                    _waiters.decr()
+                    del _wakeups[next_key]
                 if timed_out:
                     self._add_placeholder(next_key)
                     raise Empty
@@ -294,8 +397,8 @@ class ConcurrentQueue:
         countdown = 100
         while countdown:
             try:
-                value = _dict[next_key]
-                del _dict[next_key]
+                # Take the slot with a single pop rather than a lookup followed by a delete.
+                value = _dict.pop(next_key)
                 # Now handle the case that this was a placeholder. We have safely acquired it
                 # we can process getting the original.
                 if type(value) is ConcurrentQueue._PlaceHolder:
@@ -342,7 +445,9 @@ class ConcurrentQueue:
         # Start the time based (rather than yield) pause based on when we started waiting not on when this method
         # was called.
         pause_time = start + 0.05
-        while next_key not in _dict:
+        backoff = 0.0005
+        _missing = object()
+        while (value := _dict.pop(next_key, _missing)) is _missing:
             if _flags & _shutdown:
                 raise ShutDown
             if _flags & _failed:
@@ -353,13 +458,11 @@ class ConcurrentQueue:
                 self._add_placeholder(next_key)
                 raise Empty
             if it_now > pause_time:
-                _sleep(0.05)
+                backoff = min(backoff * 2, 0.05)
+                _sleep(backoff)
             else:
                 _sleep(0)
 
-        # The advantage of this less efficient logic is we know for sure that the key is in the dict here.
-        value = _dict[next_key]
-        del _dict[next_key]
         # In the case that are having huge chains of place holders to placeholders then the stack will blow out
         # which is probably a good guard against overloaded queues so we will leave this as recursive to check
         # for that situation and keep the logic simple.
@@ -396,10 +499,14 @@ class StdConcurrentQueue(ConcurrentQueue):
     compared to queue.Queue simply because this is a (mainly) lock free algorithm.
     """
 
+    __slots__ = ("_maxsize", "_active_tasks")
+
     def __init__(self, maxsize: int = 0) -> None:
+        # Producers only share the atomic in-key; the values themselves are spread over the
+        # independently locked shards of the ConcurrentDict, so give it one shard per core.
         osc = os.cpu_count()
         if osc:
-            super().__init__(scaling=max(1, osc // 2), lock_free=True)
+            super().__init__(scaling=osc, lock_free=True)
         else:
             super().__init__(lock_free=True)
 
@@ -247,4 +247,41 @@ CREATE_PY_ATOMIC_OR(uintptr, uintptr_t)
 #undef CREATE_PY_ATOMIC_OR
 
 #endif /* Py_ATOMIC_H */
+
+#if PY_VERSION_HEX < 0x030D0000
+/* Strong reference dict lookup, new in 3.13. Returns 1 and sets *result to a
+   new reference if found, 0 and NULL if not found, -1 and NULL on error. */
+// NOLINTNEXTLINE
+static inline int
+PyDict_GetItemRef(PyObject* p, PyObject* key, PyObject** result) {
+  PyObject* item = PyDict_GetItemWithError(p, key);
+  if (item != NULL) {
+    Py_INCREF(item);
+    *result = item;
+    return 1;
+  }
+  *result = NULL;
+  return PyErr_Occurred() ? -1 : 0;
+}
+
+/* Remove a key and return its value, new in 3.13. Returns 1 and sets *result
+   to the removed value if found, 0 and NULL if not found, -1 and NULL on error.
+   Without free threading the GIL makes the lookup and delete atomic. */
+// NOLINTNEXTLINE
+static inline int PyDict_Pop(PyObject* p, PyObject* key, PyObject** result) {
+  *result = NULL;
+  PyObject* item = PyDict_GetItemWithError(p, key);
+  if (item == NULL) {
+    return PyErr_Occurred() ? -1 : 0;
+  }
+  Py_INCREF(item);
+  if (PyDict_DelItem(p, key) < 0) {
+    Py_DECREF(item);
+    return -1;
+  }
+  *result = item;
+  return 1;
+}
+#endif
+
 #endif /* FT_COMPAT_H */
@@ -51,9 +51,19 @@ static int cond_wait(COND_TYPE* cond, MUTEX_TYPE* mutex) {
 #define COND_BROADCAST(cond) (pthread_cond_broadcast(&cond))
 #endif
 
+/* Hot atomic fields are followed by padding to this size so that neighbouring
+   heap objects cannot share their cache line (false sharing). */
+#define FT_CACHE_LINE_SIZE 64
+
+/* A real fetch and subtract: negating value would be signed overflow for
+   INT64_MIN. The fallback negates in unsigned arithmetic, which wraps. */
 // NOLINTNEXTLINE
 static inline int64_t atomic_int64_sub(int64_t* obj, int64_t value) {
-  return _Py_atomic_add_int64(obj, -value);
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_fetch_sub(obj, value, __ATOMIC_SEQ_CST);
+#else
+  return _Py_atomic_add_int64(obj, (int64_t)(0 - (uint64_t)value));
+#endif
 }
 
 // NOLINTNEXTLINE
@@ -61,43 +71,86 @@ static inline int64_t atomic_int32_sub(int32_t* obj, int32_t value) {
   return _Py_atomic_add_int32(obj, -value);
 }
 
+/* Relaxed fetch and add for pure counters which do not order any other memory.
+   On ARM64 this avoids the acquire/release barriers of the default ordering. */
+// NOLINTNEXTLINE
+static inline int64_t atomic_int64_add_relaxed(int64_t* obj, int64_t value) {
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_fetch_add(obj, value, __ATOMIC_RELAXED);
+#else
+  return _Py_atomic_add_int64(obj, value);
+#endif
+}
+
+/* Weak compare and exchange for read-modify-write loops. The weak form may fail
+   spuriously, which is harmless inside a retry loop, and on LL/SC architectures
+   avoids the inner retry loop the strong form expands to. On failure expected
+   is updated with the current value so callers need not reload it. */
+// NOLINTNEXTLINE
+static inline int atomic_int64_compare_exchange_weak(
+    int64_t* obj,
+    int64_t* expected,
+    int64_t desired) {
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_compare_exchange_n(
+      obj, expected, desired, 1, __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE);
+#else
+  return _Py_atomic_compare_exchange_int64(obj, expected, desired);
+#endif
+}
+
+/* Bitwise read-modify-writes map onto single instructions (lock or/xor/and on
+   x86, ldset/ldeor/ldclr on ARM64 LSE) when the compiler exposes them; only
+   fall back to a compare and exchange loop when it does not. */
 // NOLINTNEXTLINE
 static inline int64_t atomic_int64_or(int64_t* obj, int64_t value) {
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_fetch_or(obj, value, __ATOMIC_ACQ_REL);
+#else
   int64_t expected, desired;
+  expected = _Py_atomic_load_int64_relaxed(obj);
   do {
-    expected = *obj;
     desired = expected | value;
-  } while (!_Py_atomic_compare_exchange_int64(obj, &expected, desired));
+  } while (!atomic_int64_compare_exchange_weak(obj, &expected, desired));
   return expected;
+#endif
 }
 
 // NOLINTNEXTLINE
 static inline int64_t atomic_int64_xor(int64_t* obj, int64_t value) {
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_fetch_xor(obj, value, __ATOMIC_ACQ_REL);
+#else
   int64_t expected, desired;
+  expected = _Py_atomic_load_int64_relaxed(obj);
   do {
-    expected = *obj;
     desired = expected ^ value;
-  } while (!_Py_atomic_compare_exchange_int64(obj, &expected, desired));
+  } while (!atomic_int64_compare_exchange_weak(obj, &expected, desired));
   return expected;
+#endif
 }
 
 // NOLINTNEXTLINE
 static inline int64_t atomic_int64_and(int64_t* obj, int64_t value) {
+#if defined(__GNUC__) || defined(__clang__)
+  return __atomic_fetch_and(obj, value, __ATOMIC_ACQ_REL);
+#else
   int64_t expected, desired;
+  expected = _Py_atomic_load_int64_relaxed(obj);
   do {
-    expected = *obj;
     desired = expected & value;
-  } while (!_Py_atomic_compare_exchange_int64(obj, &expected, desired));
+  } while (!atomic_int64_compare_exchange_weak(obj, &expected, desired));
   return expected;
+#endif
 }
 
 // NOLINTNEXTLINE
 static inline int64_t atomic_int64_mul(int64_t* obj, int64_t value) {
   int64_t expected, desired;
+  expected = _Py_atomic_load_int64_relaxed(obj);
   do {
-    expected = *obj;
     desired = expected * value;
-  } while (!_Py_atomic_compare_exchange_int64(obj, &expected, desired));
+  } while (!atomic_int64_compare_exchange_weak(obj, &expected, desired));
   return expected;
 }
 
@@ -107,10 +160,10 @@ static inline int64_t atomic_int64_div(int64_t* obj, int64_t value) {
   if (value == 0) {
     abort();
   }
+  expected = _Py_atomic_load_int64_relaxed(obj);
   do {
-    expected = *obj;
     desired = expected / value;
-  } while (!_Py_atomic_compare_exchange_int64(obj, &expected, desired));
+  } while (!atomic_int64_compare_exchange_weak(obj, &expected, desired));
   return expected;
 }
 
@@ -216,9 +216,9 @@ LocalWrapper_richcompare(LocalWrapperObject* self, PyObject* other, int op) {
 /* The PyNumber_* methods in abstract.c handle the difference between true
    number types and sequences using slot checking. There is no need to do that
    here and the way it is done in abstract.c is efficient. We do need a work
-   around in _add because under some situations it gets called with self not
-   being a LocalWraperObject. Hopefully we can get that figured out and fixed at
-   some point.
+   around in _add and the divides because under some situations they get
+   called with self not being a LocalWraperObject. Hopefully we can get that
+   figured out and fixed at some point.
 */
 
 static PyObject* LocalWrapper_add(PyObject* self, PyObject* other) {
@@ -311,6 +311,9 @@ static PyObject* LocalWrapper_or(LocalWrapperObject* self, PyObject* other) {
   return PyNumber_Or(self->wrapped, other);
 }
 
+/* PyNumber_Long and PyNumber_Float already start with an exact int / float
+   check which just returns a new reference, so there is no fast path to add
+   here for the common numeric case. */
 static PyObject* LocalWrapper_int(LocalWrapperObject* self) {
   return PyNumber_Long(self->wrapped);
 }
@@ -339,6 +342,23 @@ static PyObject* LocalWrapper_inplace_multiply(
     LocalWrapperObject* self,
     PyObject* other) {
   other = _LW_Unwrap(other);
+  /* list and bytearray have no numeric in-place slots so the generic protocol
+     first tries int's multiply (which returns NotImplemented) before it gets to
+     the sequence repeat. With an exact int no reflected operator can take part,
+     so go straight to the sequence slot. */
+  if ((PyList_CheckExact(self->wrapped) ||
+       PyByteArray_CheckExact(self->wrapped)) &&
+      PyLong_CheckExact(other)) {
+    Py_ssize_t count = PyLong_AsSsize_t(other);
+    if (count != -1 || !PyErr_Occurred()) {
+      PyObject* result = Py_TYPE(self->wrapped)
+                             ->tp_as_sequence->sq_inplace_repeat(
+                                 self->wrapped, count);
+      LW_INPLACE_RETURN;
+    }
+    /* Let the generic path raise its usual error. */
+    PyErr_Clear();
+  }
   PyObject* result = PyNumber_InPlaceMultiply(self->wrapped, other);
   LW_INPLACE_RETURN;
 }
@@ -400,20 +420,16 @@ static PyObject* LocalWrapper_inplace_or(
   LW_INPLACE_RETURN;
 }
 
-static PyObject* LocalWrapper_floor_divide(
-    LocalWrapperObject* self,
-    PyObject* other) {
+static PyObject* LocalWrapper_floor_divide(PyObject* self, PyObject* other) {
   other = _LW_Unwrap(other);
-  PyObject* result = PyNumber_FloorDivide(self->wrapped, other);
-  LW_INPLACE_RETURN;
+  self = _LW_Unwrap(self);
+  return PyNumber_FloorDivide(self, other);
 }
 
-static PyObject* LocalWrapper_true_divide(
-    LocalWrapperObject* self,
-    PyObject* other) {
+static PyObject* LocalWrapper_true_divide(PyObject* self, PyObject* other) {
   other = _LW_Unwrap(other);
-  PyObject* result = PyNumber_TrueDivide(self->wrapped, other);
-  LW_INPLACE_RETURN;
+  self = _LW_Unwrap(self);
+  return PyNumber_TrueDivide(self, other);
 }
 
 static PyObject* LocalWrapper_inplace_floor_divide(
@@ -494,6 +510,9 @@ static PyNumberMethods LocalWrapper_as_number = {
 };
 
 static Py_hash_t LocalWrapper_hash(LocalWrapperObject* self) {
+  /* PyObject_Hash is a single load of Py_TYPE(wrapped)->tp_hash and a call, so
+     caching that slot on the wrapper would save nothing while having to track
+     __class__ assignment on the wrapped object. */
   return PyObject_Hash(self->wrapped);
 }
 
@@ -506,13 +525,32 @@ static PyObject* LocalWrapper_str(LocalWrapperObject* self) {
   return PyObject_Str(self->wrapped);
 }
 
+/* Interned "wrapped"; attribute names from code are interned so the wrapper's
+   own attribute can be recognised with a pointer compare. */
+static PyObject* LocalWrapper_wrapped_str = NULL;
+
 static PyObject* LocalWrapper_getattro(
     LocalWrapperObject* self,
     PyObject* attr_name) {
-  PyObject* result = PyObject_GenericGetAttr((PyObject*)self, attr_name);
-  if (result)
-    return result;
-  PyErr_Clear();
+  if (attr_name == LocalWrapper_wrapped_str) {
+    return Py_NewRef(self->wrapped);
+  }
+  /* LocalWrapper has no instance dict and cannot be subclassed so its own
+     attributes are exactly those found on its type. Checking the (cached) type
+     lookup first means forwarded attributes, the common case, no longer pay
+     for a failed generic lookup which creates and then discards an
+     AttributeError. CPython's type attribute cache already plays the role of
+     a per site inline cache here. _PyType_Lookup returns a borrowed reference;
+     only whether it is NULL is used so it is never dereferenced. */
+  if (_PyType_Lookup(Py_TYPE(self), attr_name) != NULL) {
+    PyObject* result = PyObject_GenericGetAttr((PyObject*)self, attr_name);
+    if (result != NULL || !PyErr_ExceptionMatches(PyExc_AttributeError)) {
+      return result;
+    }
+    /* A type level descriptor which raises AttributeError still falls through
+       to the wrapped object, as it did before the type lookup was added. */
+    PyErr_Clear();
+  }
   return PyObject_GenericGetAttr(self->wrapped, attr_name);
 }
 
@@ -925,6 +963,12 @@ static PyTypeObject BatchExecutorObjectType = {
 */
 
 static int exec_local_module(PyObject* module) {
+  if (LocalWrapper_wrapped_str == NULL) {
+    LocalWrapper_wrapped_str = PyUnicode_InternFromString("wrapped");
+    if (LocalWrapper_wrapped_str == NULL) {
+      return -1;
+    }
+  }
   if (PyType_Ready(&LocalWrapperType) < 0) {
     return -1;
   }
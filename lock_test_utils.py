@@ -5,7 +5,6 @@
 import signal
 import sys
 import threading
-import time
 import unittest
 from collections.abc import Callable
 
@@ -68,8 +67,7 @@ def run_interrupt_handling(
     thread = threading.Thread(target=worker)
     thread.start()
 
-    while not started_flag:
-        time.sleep(0.001)
+    started_flag.wait()
 
     try:
         acquire(lock)
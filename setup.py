@@ -2,12 +2,14 @@
 
 # pyre-strict
 
+import functools
 import os
 import shutil
 import sys
 import sysconfig
 
 from contextlib import contextmanager
+from pathlib import Path
 
 from setuptools import Extension, find_packages, setup
 
@@ -32,10 +34,14 @@ def check_compiler() -> None:
     print(f"Found compiler {module} -> {klass}")
 
 
+@functools.lru_cache(maxsize=1)
 def get_include_dir() -> str | None:
     """
     Get the include directory from sysconfig.
 
+    The result is cached as it is looked up by both the setup checks and the
+    extension configuration.
+
     Returns:
         The include directory path, or None if not available.
     """
@@ -126,20 +132,20 @@ def copy_files(
         tests_dir: The tests directory path.
         native_dir: The native directory path.
     """
-    for filename in os.listdir(script_dir):
-        filepath = os.path.join(script_dir, filename)
+    for entry in Path(script_dir).iterdir():
+        filename = entry.name
 
         if filename.endswith(".py"):
             # Both benchmarks and test_ files are run as tests in CI.
             if filename.startswith("test_") or filename.endswith("_bench.py"):
-                shutil.copy(filepath, tests_dir)
+                shutil.copy(entry, tests_dir)
             # Do not copy yourself into the wheel.
             elif filename != "setup.py":
-                shutil.copy(filepath, python_dir)
+                shutil.copy(entry, python_dir)
         elif filename.endswith(".c") or filename.endswith(".h"):
-            shutil.copy(filepath, native_dir)
+            shutil.copy(entry, native_dir)
         elif filename.endswith(".md"):
-            shutil.copy(filepath, build_dir)
+            shutil.copy(entry, build_dir)
 
 
 def create_init_py(module_dir: str) -> None:
@@ -168,9 +174,9 @@ def create_license(script_dir: str, build_dir: str) -> None:
     if os.path.exists(license_from):
         shutil.copy(license_from, license_to)
     else:
-        with open(license_to, "w") as f:
+        with open(license_to, "wb") as f:
             f.write(
-                "See https://github.com/facebookincubator/SocketRocket/blob/main/LICENSE\n"
+                b"See https://github.com/facebookincubator/SocketRocket/blob/main/LICENSE\n"
             )
 
 
@@ -236,11 +242,14 @@ def invoke_main() -> None:
                     # pyre-ignore
                     os.path.join(include_dir, "internal"),
                 ],
+                # Only the test helper extensions may fail to compile without
+                # failing the build; every public module imports a native one.
+                optional=module_name.startswith("_test_"),
             )
         )
 
-    with open(os.path.join(build_dir, "README.md")) as readme_file:
-        long_descr = readme_file.read()
+    with open(os.path.join(build_dir, "README.md"), "rb") as readme_file:
+        long_descr = readme_file.read().decode("utf-8")
 
     os.chdir("build")
     setup(
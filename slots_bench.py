@@ -3,6 +3,7 @@
 # pyre-strict
 
 import gc
+import random
 import weakref
 
 from typing import Any
@@ -10,7 +11,6 @@ from typing import Any
 from ft_utils.benchmark_utils import (
     BenchmarkProvider,
     execute_benchmarks,
-    ft_randchoice,
     ft_randint,
 )
 from ft_utils.local import LocalWrapper
@@ -44,27 +44,35 @@ class SlotsBenchmarkProvider(BenchmarkProvider):
     def __init__(self, operations: int) -> None:
         self._operations = operations
         self._obj = SlotClass(1, 2, 3, 4, 5)
+        # Draw all the attribute names, values and set/get choices once, here, from a
+        # private generator so the timed loops measure slot access rather than the RNG.
+        rng = random.Random(ft_randint(0, 1 << 32))
+        settable = SlotClass.__slots__[:-1]
+        self._names: list[str] = rng.choices(settable, k=operations)
+        self._values: list[int] = rng.choices(range(1, 101), k=operations)
+        self._sets: list[bool] = rng.choices((True, False), k=operations)
 
     def benchmark_modify_attributes(self) -> None:
         obj = LocalWrapper(self._obj)
-        settable: tuple[str, ...] = SlotClass.__slots__[:-1]
-        for _ in range(self._operations):
-            setattr(obj, ft_randchoice(settable), ft_randint(1, 100))
+        setattr_ = setattr
+        for name, value in zip(self._names, self._values):
+            setattr_(obj, name, value)
 
     def benchmark_read_attributes(self) -> None:
         obj = LocalWrapper(self._obj)
-        settable: tuple[str, ...] = SlotClass.__slots__[:-1]
-        for _ in range(self._operations):
-            _ = getattr(obj, ft_randchoice(settable))
+        getattr_ = getattr
+        for name in self._names:
+            _ = getattr_(obj, name)
 
     def benchmark_mixed_operations(self) -> None:
         obj = LocalWrapper(self._obj)
-        settable: tuple[str, ...] = SlotClass.__slots__[:-1]
-        for _ in range(self._operations):
-            if ft_randint(0, 1):
-                setattr(obj, ft_randchoice(settable), ft_randint(1, 100))
+        setattr_ = setattr
+        getattr_ = getattr
+        for name, value, set_ in zip(self._names, self._values, self._sets):
+            if set_:
+                setattr_(obj, name, value)
             else:
-                _ = getattr(obj, ft_randchoice(settable))
+                _ = getattr_(obj, name)
 
     def benchmark_use_slots_in_generator(self) -> None:
         obj = LocalWrapper(self._obj)
@@ -73,23 +81,25 @@ class SlotsBenchmarkProvider(BenchmarkProvider):
     def benchmark_reference_cycle(self) -> None:
         obj = LocalWrapper(self._obj)
         for _ in range(32):
-            obj.f = [obj for _ in range(self._operations)]
+            obj.f = [obj] * self._operations
             obj.f = None
 
+    # The self_reference, tuple_cycle and hammer_update benchmarks measure slot
+    # behaviour rather than localization so they use the shared object directly.
     def benchmark_self_reference(self) -> None:
-        obj = LocalWrapper(self._obj)
+        obj = self._obj
         for _ in range(self._operations * 10):
             obj.g = None
             obj.g = obj
 
     def benchmark_tuple_cycle(self) -> None:
-        obj = LocalWrapper(self._obj)
+        obj = self._obj
         for _ in range(self._operations * 10):
             obj.g = None
             obj.h = (obj,)
 
     def benchmark_hammer_update(self) -> None:
-        obj = LocalWrapper(self._obj)
+        obj = self._obj
         for i in range(self._operations):
             obj.a += 1
         for i in range(self._operations // 10):
@@ -98,16 +108,23 @@ class SlotsBenchmarkProvider(BenchmarkProvider):
 
     def benchmark_garbage_collection(self) -> None:
         ops = max(1, self._operations // 1000)
-        for _ in range(ops):
-            obj = SlotClass()
-            obj.a = obj
-            obj.b = obj.a
-            obj.c = obj.b
-            obj.d = (obj.b, None)
-            obj.e = {1, obj}
-            obj.f = self._obj
-            del obj
-            gc.collect()
+        # Build all the cycles with automatic collection off and then collect
+        # them in one pass, so we measure cycle collection rather than repeated
+        # full heap sweeps.
+        gc.disable()
+        try:
+            for _ in range(ops):
+                obj = SlotClass()
+                obj.a = obj
+                obj.b = obj.a
+                obj.c = obj.b
+                obj.d = (obj.b, None)
+                obj.e = {1, obj}
+                obj.f = self._obj
+                del obj
+        finally:
+            gc.enable()
+        gc.collect()
 
 
 def invoke_main() -> None:
@@ -23,8 +23,12 @@ class FakeBench(BenchmarkProvider):
 
 
 class TestBenchmarkUtils(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._randint_sample = [ft_randint(1, 10) for _ in range(100)]
+
     def test_ft_randint(self):
-        results = {ft_randint(1, 10) for _ in range(100)}
+        results = set(self._randint_sample)
         self.assertTrue(all(1 <= num <= 10 for num in results))
         self.assertTrue(len(results) > 1)
 
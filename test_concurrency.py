@@ -12,6 +12,12 @@ import weakref
 import ft_utils.concurrency as concurrency
 import ft_utils.local as local
 
+# str keys and values used by the ConcurrentDict tests, built once so the loops exercise the
+# dict rather than str(int).
+_K_STR = [str(i) for i in range(10000)]
+_V_STR = [str(i * 2) for i in range(10000)]
+_K_NEG_STR = [str(-(i + 1)) for i in range(1000)]
+
 
 class TestConcurrentDict(unittest.TestCase):
     def test_smoke(self):
@@ -29,31 +35,37 @@ class TestConcurrentDict(unittest.TestCase):
         dct = concurrency.ConcurrentDict()
         for i in range(10000):
             dct[i] = i + 1
-        for i in range(10000):
-            self.assertEqual(dct[i], i + 1)
-        for i in range(10000):
-            dct[str(i)] = str(i * 2)
-        for i in range(10000):
-            self.assertEqual(dct[str(i)], str(i * 2))
+        for k, v in zip(_K_STR, _V_STR):
+            dct[k] = v
+        # Verify in one comparison rather than 20000 assertEqual calls.
+        expected = {i: i + 1 for i in range(10000)}
+        expected.update(zip(_K_STR, _V_STR))
+        self.assertEqual(dct.as_dict(), expected)
 
     def test_threads(self):
-        dct = concurrency.ConcurrentDict(37)
-        lck = threading.Lock()
+        dct = concurrency.ConcurrentDict(256)
+        # Release all the workers together so they genuinely overlap rather than
+        # running one after another as they are started.
+        barrier = threading.Barrier(6)
 
         def win():
+            barrier.wait()
             for i in range(1000):
                 dct[i] = i + 1
 
         def wstr():
+            barrier.wait()
             for i in range(1000):
-                dct[str(i)] = str(i * 2)
+                dct[_K_STR[i]] = _V_STR[i]
 
         def wdel():
-            with lck:
-                for i in range(1000):
-                    dct[str(-(i + 1))] = str(i * 2)
-                for i in range(1000):
-                    del dct[str(-(i + 1))]
+            # Both wdel threads work on the same keys; pop with a default makes the
+            # removal idempotent so they need no lock between them.
+            barrier.wait()
+            for i in range(1000):
+                dct[_K_NEG_STR[i]] = _V_STR[i]
+            for k in _K_NEG_STR:
+                dct.pop(k, None)
 
         threads = [
             threading.Thread(target=win),
@@ -69,10 +81,9 @@ class TestConcurrentDict(unittest.TestCase):
             thread.start()
         for thread in threads:
             thread.join()
-        for i in range(1000):
-            self.assertEqual(dct[i], i + 1)
-        for i in range(1000):
-            self.assertEqual(dct[str(i)], str(i * 2))
+        expected = {i: i + 1 for i in range(1000)}
+        expected.update(zip(_K_STR[:1000], _V_STR))
+        self.assertEqual(dct.as_dict(), expected)
         with self.assertRaisesRegex(KeyError, "-10"):
             del dct["-10"]
 
@@ -108,6 +119,97 @@ class TestConcurrentDict(unittest.TestCase):
         del dct[legal]
         self.assertFalse(legal in dct)
 
+    def test_key_kinds(self):
+        # Start str only, then mix in ints and other hashables so the internal
+        # dicts fall back from their str only lookup.
+        dct = concurrency.ConcurrentDict(4)
+        keys = [str(i) for i in range(100)]
+        for k in keys:
+            dct[k] = k
+        for i in range(100):
+            dct[i] = i
+        dct[1.5] = 1.5
+        dct[(1, 2)] = (1, 2)
+        for k in keys + list(range(100)) + [1.5, (1, 2)]:
+            self.assertEqual(dct[k], k)
+        self.assertEqual(len(dct), 202)
+
+    def test_getitem_eq_error(self):
+        class BadEq:
+            def __hash__(self):
+                return 1
+
+            def __eq__(self, other):
+                raise RuntimeError("Invalid Eq")
+
+        dct = concurrency.ConcurrentDict()
+        dct[BadEq()] = 1
+        with self.assertRaisesRegex(RuntimeError, "Invalid Eq"):
+            dct[BadEq()]
+
+    def test_len(self):
+        dct = concurrency.ConcurrentDict(5)
+        self.assertEqual(len(dct), 0)
+        for i in range(-50, 50):
+            dct[i] = i
+        self.assertEqual(len(dct), 100)
+        del dct[0]
+        self.assertEqual(len(dct), 99)
+        with self.assertRaises(ValueError):
+            concurrency.ConcurrentDict(0)
+
+    def test_pop(self):
+        dct = concurrency.ConcurrentDict()
+        dct[1] = "one"
+        self.assertEqual(dct.pop(1), "one")
+        self.assertFalse(1 in dct)
+        self.assertIsNone(dct.pop(1, None))
+        with self.assertRaisesRegex(KeyError, "1"):
+            dct.pop(1)
+
+    def test_pop_threads(self):
+        dct = concurrency.ConcurrentDict()
+        dct.update((i, i) for i in range(1000))
+        popped = concurrency.AtomicInt64()
+
+        def worker():
+            for i in range(1000):
+                if dct.pop(i, None) is not None:
+                    popped.incr()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(popped, 1000)
+        self.assertEqual(len(dct), 0)
+
+    def test_update(self):
+        dct = concurrency.ConcurrentDict()
+        dct.update({i: i + 1 for i in range(1000)})
+        dct.update((str(i), str(i * 2)) for i in range(1000))
+        for i in range(1000):
+            self.assertEqual(dct[i], i + 1)
+            self.assertEqual(dct[str(i)], str(i * 2))
+        other = concurrency.ConcurrentDict(3)
+        other.update(dct)
+        self.assertEqual(other.as_dict(), dct.as_dict())
+        with self.assertRaises(ValueError):
+            dct.update([(1, 2, 3)])
+        with self.assertRaises(TypeError):
+            dct.update([1])
+
+    def test_get_many(self):
+        dct = concurrency.ConcurrentDict()
+        dct.update(zip(range(10000), range(1, 10001)))
+        self.assertEqual(dct.get_many(range(10000)), tuple(range(1, 10001)))
+        self.assertEqual(dct.get_many([]), ())
+        with self.assertRaisesRegex(KeyError, "-1"):
+            dct.get_many([1, -1])
+        with self.assertRaises(TypeError):
+            dct.get_many(1)
+
     def test_as_dict(self):
         cdct = concurrency.ConcurrentDict()
         for i in range(1024):
@@ -282,6 +384,53 @@ class TestAtomicInt64(unittest.TestCase):
         ai = concurrency.AtomicInt64(10)
         self.assertEqual(ai.decr(), 9)
 
+    def test_exchange(self):
+        ai = concurrency.AtomicInt64(10)
+        self.assertEqual(ai.exchange(~10), 10)
+        self.assertEqual(ai, -11)
+        self.assertEqual(ai.exchange(concurrency.AtomicInt64(3)), -11)
+        self.assertEqual(ai, 3)
+        with self.assertRaises(TypeError):
+            ai.exchange("3")
+
+    def test_incr_by(self):
+        ai = concurrency.AtomicInt64(10)
+        self.assertIsNone(ai.incr_by(5))
+        self.assertEqual(ai, 15)
+        self.assertIsNone(ai.decr_by(concurrency.AtomicInt64(20)))
+        self.assertEqual(ai, -5)
+        ai.incr_by(1 << 40)
+        self.assertEqual(ai, (1 << 40) - 5)
+        with self.assertRaises(TypeError):
+            ai.incr_by(1.0)
+
+    def test_decr_by_int64_min(self):
+        int64_min = -(1 << 63)
+        ai = concurrency.AtomicInt64(-1)
+        self.assertIsNone(ai.decr_by(int64_min))
+        self.assertEqual(ai, (1 << 63) - 1)
+        ai = concurrency.AtomicInt64(int64_min)
+        ai.decr_by(concurrency.AtomicInt64(int64_min))
+        self.assertEqual(ai, 0)
+        ai -= int64_min
+        self.assertEqual(ai, int64_min)
+
+    def test_overflow_operand(self):
+        ai = concurrency.AtomicInt64(10)
+        with self.assertRaises(OverflowError):
+            ai += 1 << 64
+        with self.assertRaises(OverflowError):
+            ai.incr_by(1 << 64)
+        with self.assertRaises(OverflowError):
+            ai + (1 << 64)
+        self.assertEqual(ai, 10)
+
+    def test_relaxed(self):
+        ai = concurrency.AtomicInt64(10)
+        self.assertEqual(ai.incr_relaxed(), 11)
+        self.assertEqual(ai.decr_relaxed(), 10)
+        self.assertEqual(ai.decr_relaxed(), 9)
+
     def test_compare(self):
         ai = concurrency.AtomicInt64()
         self.assertGreater(1, ai)
@@ -303,10 +452,62 @@ class TestAtomicInt64(unittest.TestCase):
             t.join()
         self.assertEqual(ai.get(), 10000)
 
+    def test_threads_relaxed(self):
+        ai = concurrency.AtomicInt64(0)
+
+        def worker(n):
+            for _ in range(n):
+                ai.incr_relaxed()
+
+        threads = [threading.Thread(target=worker, args=(1000,)) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(ai.get(), 10000)
+
+    def test_threads_relaxed_returns(self):
+        # Relaxed ordering still makes each increment and decrement atomic, so
+        # every call returns a distinct value and the final count is exact.
+        ai = concurrency.AtomicInt64(0)
+        nthread = 10
+        count = 1000
+        incrs = [[] for _ in range(nthread)]
+        decrs = [[] for _ in range(nthread)]
+
+        def incr_worker(n):
+            for _ in range(count):
+                incrs[n].append(ai.incr_relaxed())
+
+        def decr_worker(n):
+            for _ in range(count):
+                decrs[n].append(ai.decr_relaxed())
+
+        for worker, returns in ((incr_worker, incrs), (decr_worker, decrs)):
+            threads = [
+                threading.Thread(target=worker, args=(n,)) for n in range(nthread)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            for values in returns:
+                self.assertEqual(len(values), count)
+        total = nthread * count
+        self.assertEqual(
+            sorted(v for values in incrs for v in values), list(range(1, total + 1))
+        )
+        self.assertEqual(
+            sorted(v for values in decrs for v in values), list(range(total))
+        )
+        self.assertEqual(ai.get(), 0)
+
     def test_threads_set(self):
         ai = concurrency.AtomicInt64(0)
+        barrier = threading.Barrier(10)
 
         def worker(n):
+            barrier.wait()
             ai.set(n)
 
         threads = [threading.Thread(target=worker, args=(10,)) for _ in range(10)]
@@ -316,12 +517,53 @@ class TestAtomicInt64(unittest.TestCase):
             t.join()
         self.assertEqual(ai.get(), 10)
 
+    def test_padding(self):
+        # The value has a cache line of padding either side; the exact offsets are checked at
+        # compile time.
+        self.assertGreaterEqual(
+            concurrency.AtomicInt64.__basicsize__, object.__basicsize__ + 2 * 64
+        )
+
     def test_format(self):
         ai = concurrency.AtomicInt64(10)
         self.assertEqual(f"{ai:x}", "a")
         self.assertEqual(f"{ai:b}", "1010")
         self.assertEqual(f"{ai:o}", "12")
         self.assertEqual(f"{ai:d}", "10")
+        self.assertEqual(f"{ai:X}", "A")
+        self.assertEqual(f"{ai}", "10")
+        self.assertEqual(f"{ai:>5}", "   10")
+        for value in (0, -10, 2**63 - 1, -(2**63)):
+            ai.set(value)
+            for spec in ("", "d", "x", "X", "o", "b", "n", "+d"):
+                self.assertEqual(format(ai, spec), format(value, spec))
+
+
+class TestAtomicFlag(unittest.TestCase):
+    def test_smoke(self):
+        flag = concurrency.AtomicFlag(False)
+        self.assertFalse(flag)
+        flag.set(True)
+        self.assertTrue(flag)
+
+    def test_wait(self):
+        flag = concurrency.AtomicFlag(False)
+
+        def worker():
+            time.sleep(0.1)
+            flag.set(True)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        self.assertTrue(flag.wait(timeout=10))
+        t.join()
+        self.assertTrue(flag.wait())
+
+    def test_wait_timeout(self):
+        flag = concurrency.AtomicFlag(False)
+        start = time.monotonic()
+        self.assertFalse(flag.wait(timeout=0.1))
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
 
 
 class BreakingDict(dict):
@@ -400,15 +642,21 @@ class TestConcurrentQueue(unittest.TestCase):
 
     def test_empty_queue(self):
         q = self._get_queue()
+        start = threading.Event()
 
         def worker():
-            time.sleep(0.1)
+            start.wait()
             q.push(10)
 
-        for _ in range(5):
+        # Hand off with an event rather than sleeping so the push races the pop; test_pop covers
+        # a pop which is certainly blocked before the push.
+        for _ in range(100):
+            start.clear()
             t = threading.Thread(target=worker)
             t.start()
+            start.set()
             self.assertEqual(q.pop(), 10)
+            t.join()
 
     def test_pop(self):
         q = self._get_queue()
@@ -433,8 +681,7 @@ class TestConcurrentQueue(unittest.TestCase):
 
         t = threading.Thread(target=worker)
         t.start()
-        while not f:
-            pass
+        f.wait()
         self.assertEqual(q.pop(timeout=1), 10)
         t.join()
 
@@ -449,8 +696,7 @@ class TestConcurrentQueue(unittest.TestCase):
 
         t = threading.Thread(target=worker)
         t.start()
-        while not f:
-            pass
+        f.wait()
         with self.assertRaises(queue.Empty):
             q.pop(timeout=0.1)
         t.join()
@@ -560,6 +806,42 @@ class TestConcurrentQueue(unittest.TestCase):
         s2 = {p_vals[v] for v in range(count)}
         self.assertEqual(s1, s2)
 
+    def test_push_pop_race(self):
+        # Blocking pops racing pushes must all complete; a missed wake up may
+        # only delay a pop.
+        q = self._get_queue()
+        nthread = 4
+        per_thread = 250
+        popped = concurrency.ConcurrentDict()
+        start = threading.Barrier(nthread * 2)
+
+        def producer(base):
+            start.wait()
+            for i in range(per_thread):
+                q.push(base + i)
+
+        def consumer(n):
+            start.wait()
+            for i in range(per_thread):
+                popped[n * per_thread + i] = q.pop()
+
+        threads = [
+            threading.Thread(target=producer, args=(n * per_thread,))
+            for n in range(nthread)
+        ]
+        threads += [
+            threading.Thread(target=consumer, args=(n,)) for n in range(nthread)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+            self.assertFalse(t.is_alive(), "pop did not return")
+        self.assertEqual(
+            {popped[k] for k in range(nthread * per_thread)},
+            set(range(nthread * per_thread)),
+        )
+
 
 class TestConcurrentQueueLockFree(TestConcurrentQueue):
     def _get_queue(self):
@@ -594,8 +876,7 @@ class TestStdConcurrentQueue(unittest.TestCase):
         threads = [threading.Thread(target=worker, args=(10,)) for _ in range(10)]
         for t in threads:
             t.start()
-        while not flag:
-            pass
+        flag.wait()
         for t in threads:
             t.join()
         for _ in range(100):
@@ -613,8 +894,7 @@ class TestStdConcurrentQueue(unittest.TestCase):
 
         t = threading.Thread(target=worker)
         t.start()
-        while not flag:
-            pass
+        flag.wait()
         self.assertEqual(q.get(timeout=1), 10)
         t.join()
 
@@ -629,8 +909,7 @@ class TestStdConcurrentQueue(unittest.TestCase):
 
         t = threading.Thread(target=worker)
         t.start()
-        while not flag:
-            pass
+        flag.wait()
         with self.assertRaises(queue.Empty):
             q.get(timeout=0.1)
         t.join()
@@ -646,8 +925,7 @@ class TestStdConcurrentQueue(unittest.TestCase):
 
         t = threading.Thread(target=worker)
         t.start()
-        while not flag:
-            pass
+        flag.wait()
         self.assertEqual(q.get(), 10)
         t.join()
 
@@ -666,19 +944,19 @@ class TestStdConcurrentQueue(unittest.TestCase):
 
     def test_empty_queue(self):
         q = self._get_queue()
-        flag = concurrency.AtomicFlag(False)
+        start = threading.Event()
 
         def worker():
-            flag.set(True)
-            time.sleep(0.1)
+            start.wait()
             q.put(10)
 
-        for _ in range(5):
+        for _ in range(100):
+            start.clear()
             t = threading.Thread(target=worker)
             t.start()
-            while not flag:
-                pass
+            start.set()
             self.assertEqual(q.get(), 10)
+            t.join()
 
     def test_qsize(self):
         q = self._get_queue()
@@ -1151,15 +1429,19 @@ class TestConcurrentGatheringIterator(unittest.TestCase):
 
     def test_empty_iterator(self):
         iterator = concurrency.ConcurrentGatheringIterator()
+        start = threading.Event()
 
         def worker():
-            time.sleep(0.1)
+            start.wait()
             iterator.insert(0, 10)
 
-        for _ in range(5):
+        for _ in range(100):
+            start.clear()
             t = threading.Thread(target=worker)
             t.start()
+            start.set()
             self.assertEqual(list(iterator.iterator(0)), [10])
+            t.join()
 
     def test_max_key(self):
         iterator = concurrency.ConcurrentGatheringIterator()
@@ -1200,8 +1482,10 @@ class TestAtomicReference(unittest.TestCase):
 
     def test_concurrency_set(self):
         ref = concurrency.AtomicReference()
+        barrier = threading.Barrier(10)
 
         def set_ref(value):
+            barrier.wait()
             ref.set(value)
 
         threads = []
@@ -1233,6 +1517,40 @@ class TestAtomicReference(unittest.TestCase):
 
         self.assertIn(ref.get(), range(1, 11))
 
+    def test_concurrency_get_exchange(self):
+        class Foo:
+            def __init__(self, value):
+                self.value = value
+
+        ref = concurrency.AtomicReference(Foo(0))
+        done = concurrency.AtomicFlag(False)
+        seen = []
+
+        def reader():
+            count = 0
+            while not done:
+                # A torn read would hand back a freed object.
+                self.assertIsInstance(ref.get().value, int)
+                count += 1
+            seen.append(count)
+
+        def writer(base):
+            for i in range(1000):
+                ref.exchange(Foo(base + i))
+                ref.set(Foo(base + i))
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        writers = [threading.Thread(target=writer, args=(i * 1000,)) for i in range(4)]
+        for t in readers + writers:
+            t.start()
+        for t in writers:
+            t.join()
+        done.set(True)
+        for t in readers:
+            t.join()
+        self.assertEqual(len(seen), 4)
+        self.assertIsInstance(ref.get().value, int)
+
     def test_gc_acyclic(self):
         class Foo:
             pass
@@ -1291,6 +1609,11 @@ class TestAtomicReference(unittest.TestCase):
             gc.collect()
             self.assertTrue(gc.garbage == [])
 
+    def test_padding(self):
+        self.assertGreaterEqual(
+            concurrency.AtomicReference.__basicsize__, object.__basicsize__ + 2 * 64
+        )
+
     def test_arg_count(self):
         x = concurrency.AtomicReference()
         self.assertIs(x.get(), None)
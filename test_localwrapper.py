@@ -2,12 +2,13 @@
 
 # pyre-unsafe
 
+import array
 import asyncio
 import gc
+import operator
 import traceback
 import unittest
-
-from contextlib import ContextDecorator
+import weakref
 
 from ft_utils.local import LocalWrapper
 
@@ -48,7 +49,7 @@ class TestLocalWrapperSmokes(unittest.TestCase):
         self.assertEqual(len(self.wrapper), len(self.obj))
 
     def test_iter(self):
-        self.assertListEqual(list(iter(self.wrapper)), self.obj)
+        self.assertListEqual(list(self.wrapper), self.obj)
 
     def test_call(self):
         self.wrapper.append(4)
@@ -74,6 +75,21 @@ class TestLocalWrapperSmokes(unittest.TestCase):
         self.obj *= 3
         self.assertEqual(self.wrapper, self.obj)
 
+    def test_inplace_operations_types(self):
+        self.wrapper += (4,)
+        self.wrapper += b"\x05"
+        self.wrapper *= True
+        self.assertIs(self.wrapper.wrapped, self.obj)
+        self.assertEqual(self.obj, [1, 2, 3, 4, 5])
+
+        class RAdd:
+            def __radd__(self, other):
+                return "radd"
+
+        # A reflected operator on the right still takes part.
+        self.wrapper += RAdd()
+        self.assertEqual(self.wrapper.wrapped, "radd")
+
     def test_inplace_operations_recursive(self):
         id_checker = self.wrapper.wrapped
         self.wrapper += LocalWrapper([4, 5])
@@ -96,18 +112,17 @@ class TestLocalWrapperSmokes(unittest.TestCase):
         self.assertEqual(float(num_wrapper), 10.0)
 
     def test_gc(self):
+        # Each rebinding drops the previous wrapper so a single collection at the end covers
+        # every case, including the self referencing cycle.
         del self.wrapper
-        gc.collect()
-        self.assertTrue(gc.garbage == [])
         self.wrapper = LocalWrapper(self)
-        gc.collect()
-        self.assertTrue(gc.garbage == [])
         self.wrapper = LocalWrapper((self, self))
-        gc.collect()
-        self.assertTrue(gc.garbage == [])
         self.wrapper = LocalWrapper([self, None])
         self.wrapper[1] = self.wrapper
+        weak_wrapper = weakref.ref(self.wrapper)
+        del self.wrapper
         gc.collect()
+        self.assertIsNone(weak_wrapper())
         self.assertTrue(gc.garbage == [])
 
     def test_repr(self):
@@ -144,8 +159,10 @@ class TestLocalWrapperSmokes(unittest.TestCase):
 
 
 class TestLocalWrapperBytearray(unittest.TestCase):
-    def setUp(self):
-        self.wrapper = LocalWrapper(bytearray([1, 2]))
+    # None of these tests mutate the wrapper so it is built once for the class.
+    @classmethod
+    def setUpClass(cls):
+        cls.wrapper = LocalWrapper(bytearray([1, 2]))
 
     def test_bytearray_addition(self):
         self.assertEqual(self.wrapper + self.wrapper, bytearray([1, 2, 1, 2]))
@@ -159,15 +176,30 @@ class TestLocalWrapperBytearray(unittest.TestCase):
         self.assertTrue(self.wrapper == self.wrapper.wrapped)
         self.assertTrue(self.wrapper.wrapped == self.wrapper)
 
+    def test_bytearray_inplace(self):
+        ba = bytearray([1, 2])
+        wrapper = LocalWrapper(ba)
+        wrapper += bytearray([3])
+        wrapper += b"\x04"
+        wrapper += LocalWrapper(bytearray([5]))
+        wrapper *= 2
+        self.assertIs(wrapper.wrapped, ba)
+        self.assertEqual(ba, bytearray([1, 2, 3, 4, 5] * 2))
+        with self.assertRaises(TypeError):
+            wrapper += (6,)
+        with self.assertRaises(OverflowError):
+            wrapper *= 1 << 100
+
 
 class TestLocalWrapperIterExtra(unittest.TestCase):
-    def setUp(self):
-        self.obj = (1, 2, 3)
-        self.wrapper = LocalWrapper(self.obj)
+    @classmethod
+    def setUpClass(cls):
+        cls.obj = (1, 2, 3)
+        cls.wrapper = LocalWrapper(cls.obj)
 
     def test_empty_iter(self):
         empty_wrapper = LocalWrapper([])
-        self.assertListEqual(list(iter(empty_wrapper)), [])
+        self.assertListEqual(list(empty_wrapper), [])
 
     def test_exception_in_iteration(self):
         class CustomIterable:
@@ -179,19 +211,20 @@ class TestLocalWrapperIterExtra(unittest.TestCase):
 
         error_wrapper = LocalWrapper(CustomIterable())
         with self.assertRaises(RuntimeError):
-            list(iter(error_wrapper))
+            list(error_wrapper)
 
     def test_multiple_iterations(self):
-        iter1 = tuple(iter(self.wrapper))
-        iter2 = tuple(iter(self.wrapper))
+        iter1 = tuple(self.wrapper)
+        iter2 = tuple(self.wrapper)
         self.assertEqual(iter1, self.obj)
         self.assertEqual(iter2, self.obj)
 
 
 class TestLocalWrapperHash(unittest.TestCase):
-    def setUp(self):
-        self.obj = "Hello World"
-        self.wrapper = LocalWrapper(self.obj)
+    @classmethod
+    def setUpClass(cls):
+        cls.obj = "Hello World"
+        cls.wrapper = LocalWrapper(cls.obj)
 
     def test_hash(self):
         obj_hash = hash(self.obj)
@@ -211,9 +244,12 @@ class TestLocalWrapperHash(unittest.TestCase):
 
 
 class TestLocalWrapperBuffer(unittest.TestCase):
-    def setUp(self):
-        self.byte_array = bytearray(b"example data")
-        self.wrapper = LocalWrapper(self.byte_array)
+    # Shared by the tests which only read through the buffer; test_buffer_integrity writes and
+    # so builds its own.
+    @classmethod
+    def setUpClass(cls):
+        cls.byte_array = bytearray(b"example data")
+        cls.wrapper = LocalWrapper(cls.byte_array)
 
     def test_getbuffer(self):
         buf = memoryview(self.wrapper)
@@ -226,15 +262,18 @@ class TestLocalWrapperBuffer(unittest.TestCase):
         self.assertTrue(True)
 
     def test_buffer_integrity(self):
-        with memoryview(self.wrapper) as buf:
+        byte_array = bytearray(b"example data")
+        with memoryview(LocalWrapper(byte_array)) as buf:
             buf[0] = ord("z")
-        self.assertEqual(self.byte_array[0], ord("z"))
+        self.assertEqual(byte_array[0], ord("z"))
 
     def test_buffer_type(self):
         buf = memoryview(self.wrapper)
         self.assertIsInstance(buf, memoryview)
 
 
+# NumberAPI implements the number protocol with plain Python methods on purpose: it is how the
+# tests check that LocalWrapper forwards its number slots to Python level dunder methods.
 class NumberAPI:
     def __init__(self, value):
         self.value = value
@@ -352,46 +391,39 @@ class TestLocalWrapperInt(unittest.TestCase):
         self.num = 10
         self.wrapper = LocalWrapper(self.num)
 
-    def test_add(self):
-        result = self.wrapper + 5
-        self.assertEqual(result, 15)
-
-    def test_subtract(self):
-        result = self.wrapper - 5
-        self.assertEqual(result, 5)
-
-    def test_multiply(self):
-        result = self.wrapper * 5
-        self.assertEqual(result, 50)
-
-    def test_divide(self):
-        result = self.wrapper / 2
-        self.assertEqual(result, 5)
-
-    def test_floor_divide(self):
-        result = self.wrapper // 3
-        self.assertEqual(result, 3)
-
-    def test_modulus(self):
-        result = self.wrapper % 3
-        self.assertEqual(result, 1)
-
-    def test_power(self):
-        result = self.wrapper**2
-        self.assertEqual(result, 100)
-
-    def test_negative(self):
-        result = -self.wrapper
-        self.assertEqual(result, -10)
-
-    def test_positive(self):
-        result = +self.wrapper
-        self.assertEqual(result, 10)
-
-    def test_absolute(self):
-        negative_wrapper = LocalWrapper(-10)
-        result = abs(negative_wrapper)
-        self.assertEqual(result, 10)
+    # Operations which leave the wrapper untouched, as (name, operation, expected).
+    OPS = (
+        ("add", lambda w: w + 5, 15),
+        ("subtract", lambda w: w - 5, 5),
+        ("multiply", lambda w: w * 5, 50),
+        ("divide", lambda w: w / 2, 5),
+        ("floor_divide", lambda w: w // 3, 3),
+        ("modulus", lambda w: w % 3, 1),
+        ("power", lambda w: w**2, 100),
+        ("negative", lambda w: -w, -10),
+        ("positive", lambda w: +w, 10),
+        ("absolute", lambda w: abs(LocalWrapper(-10)), 10),
+        ("int", int, 10),
+        ("float", float, 10.0),
+        ("divmod", lambda w: divmod(w, 3), (3, 1)),
+        ("invert", lambda w: ~w, -11),
+    )
+
+    def test_ops(self):
+        for name, op, expected in self.OPS:
+            with self.subTest(name):
+                self.assertEqual(op(self.wrapper), expected)
+
+    def test_divide_keeps_wrapped(self):
+        # The plain divides must not rebind the wrapper as their in-place forms do.
+        self.assertEqual(self.wrapper / 2, 5)
+        self.assertIs(self.wrapper.wrapped, self.num)
+        self.assertEqual(self.wrapper // 3, 3)
+        self.assertIs(self.wrapper.wrapped, self.num)
+
+    def test_reflected_divide(self):
+        self.assertEqual(3 / LocalWrapper(2), 1.5)
+        self.assertEqual(3 // LocalWrapper(2), 1)
 
     def test_inplace_add(self):
         self.wrapper += 5
@@ -426,91 +458,42 @@ class TestLocalWrapperInt(unittest.TestCase):
         zero_wrapper = LocalWrapper(0)
         self.assertFalse(bool(zero_wrapper))
 
-    def test_int(self):
-        self.assertEqual(int(self.wrapper), 10)
-
-    def test_float(self):
-        self.assertEqual(float(self.wrapper), 10.0)
-
-    def test_divmod(self):
-        self.assertEqual(divmod(self.wrapper, 3), (3, 1))
-
-    def test_invertd(self):
-        self.assertEqual(~self.wrapper, -11)
-
 
 class TestLocalWrapperNotImpl(unittest.TestCase):
-    def setUp(self):
-        self.not_num = object()
-        self.wrapper = LocalWrapper(self.not_num)
-
-    def test_add(self):
-        with self.assertRaises(TypeError):
-            self.wrapper + 5
-
-    def test_subtract(self):
-        with self.assertRaises(TypeError):
-            self.wrapper - 5
-
-    def test_multiply(self):
-        with self.assertRaises(TypeError):
-            self.wrapper * 5
-
-    def test_divide(self):
-        with self.assertRaises(TypeError):
-            self.wrapper / 2
-
-    def test_floor_divide(self):
-        with self.assertRaises(TypeError):
-            self.wrapper // 3
-
-    def test_modulus(self):
-        with self.assertRaises(TypeError):
-            self.wrapper % 3
-
-    def test_power(self):
-        with self.assertRaises(TypeError):
-            self.wrapper**2
-
-    def test_negative(self):
-        with self.assertRaises(TypeError):
-            -self.wrapper
-
-    def test_positive(self):
-        with self.assertRaises(TypeError):
-            +self.wrapper
-
-    def test_absolute(self):
-        with self.assertRaises(TypeError):
-            abs(self.wrapper)
-
-    def test_inplace_add(self):
-        with self.assertRaises(TypeError):
-            self.wrapper += 5
-
-    def test_inplace_subtract(self):
-        with self.assertRaises(TypeError):
-            self.wrapper -= 5
-
-    def test_inplace_multiply(self):
-        with self.assertRaises(TypeError):
-            self.wrapper *= 5
-
-    def test_inplace_divide(self):
-        with self.assertRaises(TypeError):
-            self.wrapper /= 2
-
-    def test_inplace_floor_divide(self):
-        with self.assertRaises(TypeError):
-            self.wrapper //= 3
-
-    def test_inplace_modulus(self):
-        with self.assertRaises(TypeError):
-            self.wrapper %= 3
-
-    def test_inplace_power(self):
-        with self.assertRaises(TypeError):
-            self.wrapper **= 2
+    # Every operation here fails before anything is rebound, so the wrapper can be shared.
+    @classmethod
+    def setUpClass(cls):
+        cls.not_num = object()
+        cls.wrapper = LocalWrapper(cls.not_num)
+
+    OPS = (
+        ("add", lambda w: w + 5),
+        ("subtract", lambda w: w - 5),
+        ("multiply", lambda w: w * 5),
+        ("divide", lambda w: w / 2),
+        ("floor_divide", lambda w: w // 3),
+        ("modulus", lambda w: w % 3),
+        ("power", lambda w: w**2),
+        ("negative", lambda w: -w),
+        ("positive", lambda w: +w),
+        ("absolute", abs),
+        ("inplace_add", lambda w: operator.iadd(w, 5)),
+        ("inplace_subtract", lambda w: operator.isub(w, 5)),
+        ("inplace_multiply", lambda w: operator.imul(w, 5)),
+        ("inplace_divide", lambda w: operator.itruediv(w, 2)),
+        ("inplace_floor_divide", lambda w: operator.ifloordiv(w, 3)),
+        ("inplace_modulus", lambda w: operator.imod(w, 3)),
+        ("inplace_power", lambda w: operator.ipow(w, 2)),
+        ("int", int),
+        ("float", float),
+        ("divmod", lambda w: divmod(w, 3)),
+        ("invert", lambda w: ~w),
+    )
+
+    def test_unsupported_ops(self):
+        for name, op in self.OPS:
+            with self.subTest(op=name), self.assertRaises(TypeError):
+                op(self.wrapper)
 
     def test_bool(self):
         class Thing:
@@ -521,24 +504,8 @@ class TestLocalWrapperNotImpl(unittest.TestCase):
         with self.assertRaises(TypeError):
             bool(wrapper)
 
-    def test_int(self):
-        with self.assertRaises(TypeError):
-            int(self.wrapper)
 
-    def test_float(self):
-        with self.assertRaises(TypeError):
-            float(self.wrapper)
-
-    def test_divmod(self):
-        with self.assertRaises(TypeError):
-            divmod(self.wrapper, 3)
-
-    def test_invertd(self):
-        with self.assertRaises(TypeError):
-            ~self.wrapper
-
-
-class AttrDel(ContextDecorator):
+class AttrDel:
     def __init__(self, obj, attr):
         self.obj = obj
         self.attr = attr
@@ -561,6 +528,8 @@ class TestLocalWrapperNumberAPI(TestLocalWrapperInt):
         self.wrapper = LocalWrapper(self.num)
 
 
+# ASequence and NumberAPI keep an instance __dict__: testChangeType switches an instance's
+# __class__ from one to the other, which needs the two layouts to match.
 class ASequence:
     def __init__(self):
         self._items = []
@@ -596,26 +565,19 @@ class ASequence:
 
 class TestMutations(unittest.TestCase):
     def testRemoveAdd(self):
-        num = NumberAPI(10)
-        wrapper = LocalWrapper(num)
-        with AttrDel(NumberAPI, "__add__"):
-            with self.assertRaisesRegex(
-                TypeError, "unsupported operand type.*NumberAPI.*int"
-            ):
-                res = wrapper + 1
-        res = wrapper + 1
-        self.assertEqual(res, 11)
-
-    def testAddAdd(self):
+        # Removing and restoring a class attribute invalidates the type's caches, so do it once
+        # for both a wrapper created before the removal and one created during it.
+        wrappers = {"before": LocalWrapper(NumberAPI(10))}
         with AttrDel(NumberAPI, "__add__"):
-            num = NumberAPI(10)
-            wrapper = LocalWrapper(num)
-            with self.assertRaisesRegex(
-                TypeError, "unsupported operand type.*NumberAPI.*int"
-            ):
-                res = wrapper + 1
-        res = wrapper + 1
-        self.assertEqual(res, 11)
+            wrappers["during"] = LocalWrapper(NumberAPI(10))
+            for created, wrapper in wrappers.items():
+                with self.subTest(created=created), self.assertRaisesRegex(
+                    TypeError, "unsupported operand type.*NumberAPI.*int"
+                ):
+                    wrapper + 1
+        for created, wrapper in wrappers.items():
+            with self.subTest(created=created):
+                self.assertEqual(wrapper + 1, 11)
 
     def testChangeWrapped(self):
         wrapper = LocalWrapper(23)
@@ -638,36 +600,55 @@ class TestMutations(unittest.TestCase):
 
 
 class Matrix:
+    __slots__ = ("rows", "cols", "_flat")
+
     def __init__(self, rows, cols):
         self.rows = rows
         self.cols = cols
-        self.data = [[0 for _ in range(cols)] for _ in range(rows)]
+        # One flat row major buffer rather than a list per row.
+        self._flat = array.array("d", bytes(8 * rows * cols))
+
+    @property
+    def data(self):
+        cols = self.cols
+        return [
+            self._flat[i * cols : (i + 1) * cols].tolist() for i in range(self.rows)
+        ]
 
     def __getitem__(self, index):
-        return self.data[index]
+        # A view of the row so m[i][j] = v writes through to the buffer.
+        return memoryview(self._flat)[index * self.cols : (index + 1) * self.cols]
 
     def __setitem__(self, index, value):
-        self.data[index] = value
+        self._flat[index * self.cols : (index + 1) * self.cols] = array.array(
+            "d", value
+        )
 
-    def __matmul__(self, other):
+    def _product(self, other):
         if self.cols != other.rows:
             raise ValueError("Matrices cannot be multiplied")
-        result = Matrix(self.rows, other.cols)
+        a = self._flat
+        b = other._flat
+        inner = self.cols
+        cols = other.cols
+        out = array.array("d", bytes(8 * self.rows * cols))
         for i in range(self.rows):
-            for j in range(other.cols):
-                for k in range(self.cols):
-                    result[i][j] += self[i][k] * other[k][j]
+            row = a[i * inner : (i + 1) * inner]
+            for j in range(cols):
+                out[i * cols + j] = sum(x * y for x, y in zip(row, b[j::cols]))
+        return out
+
+    def __matmul__(self, other):
+        # Adopt the product buffer rather than zero filling one in __init__ only to replace it.
+        result = Matrix.__new__(Matrix)
+        result._flat = self._product(other)
+        result.rows = self.rows
+        result.cols = other.cols
         return result
 
     def __imatmul__(self, other):
-        if self.cols != other.rows:
-            raise ValueError("Matrices cannot be multiplied")
-        result = Matrix(self.rows, other.cols)
-        for i in range(self.rows):
-            for j in range(other.cols):
-                for k in range(self.cols):
-                    result[i][j] += self[i][k] * other[k][j]
-        self.data = result.data
+        self._flat = self._product(other)
+        self.cols = other.cols
         return self
 
     def __repr__(self):
@@ -784,6 +765,8 @@ class WithSlots:
 
 
 class WithProperties:
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         self._value = value
 
@@ -830,6 +813,16 @@ class TestLocalWrapperAttributes(unittest.TestCase):
         with self.assertRaises(AttributeError):
             wrapper.nonexistent
 
+    def test_own_attributes(self):
+        obj = WithProperties(100)
+        wrapper = LocalWrapper(obj)
+        self.assertIs(wrapper.wrapped, obj)
+        # A name built at runtime is not interned and takes the general path.
+        name = "".join(["wrap", "ped"])
+        self.assertIs(getattr(wrapper, name), obj)
+        self.assertIs(wrapper.__class__, LocalWrapper)
+        self.assertEqual(wrapper.value, 100)
+
 
 class TestLocalWrapperCallables(unittest.TestCase):
     def setUp(self):
@@ -877,7 +870,8 @@ class TestLocalWrapperWithCoroutine(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         # Define a simple coroutine
         async def sample_coroutine(x, y):
-            await asyncio.sleep(0.1)  # Simulate async operation
+            # Yield to the event loop to simulate async operation
+            await asyncio.sleep(0)
             return x + y
 
         self.coro = sample_coroutine
@@ -892,7 +886,7 @@ class TestLocalWrapperWithCoroutine(unittest.IsolatedAsyncioTestCase):
     async def test_coroutine_exception_propagation(self):
         # Define a coroutine that raises an exception
         async def error_coroutine():
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0)
             raise ValueError("Intentional error for testing.")
 
         error_wrapper = LocalWrapper(error_coroutine)
@@ -904,28 +898,36 @@ class TestLocalWrapperWithCoroutine(unittest.IsolatedAsyncioTestCase):
 
 
 class ContextBase:
+    __slots__ = ("enter_called", "exit_called")
+
     def __init__(self):
         self.enter_called = False
         self.exit_called = False
 
 
 class MissingExitContextManager(ContextBase):
+    __slots__ = ()
+
     def __enter__(self):
         self.enter_called = True
         return "enter_value"
 
 
 class MissingEnterContextManager(ContextBase):
+    __slots__ = ()
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.exit_called = True
         return False  # Do not suppress exceptions
 
 
 class SimpleContextManager(MissingEnterContextManager, MissingExitContextManager):
-    pass
+    __slots__ = ()
 
 
 class RaisingContextManager:
+    __slots__ = ("raise_exit", "raise_enter", "enter_called", "exit_called")
+
     def __init__(self, raise_exit=False, raise_enter=False):
         self.raise_exit = raise_exit
         self.raise_enter = raise_enter
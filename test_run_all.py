@@ -2,32 +2,65 @@
 
 # pyre-unsafe
 
+import argparse
 import os
 import subprocess
 import sys
+from concurrent.futures import as_completed, ThreadPoolExecutor
 
 
-def run_test(filename):
-    print(f"Running {filename}...")
+def _module_name(filename):
     f_head, f_tail = os.path.splitext(filename)
     if f_tail != ".py":
         raise ValueError(f"filename `{filename}` is not a Python (.py) file")
-    module = f"ft_utils.tests.{f_head}"
-    result = subprocess.run(
-        [sys.executable, "-m", module], stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    )
-    if result.returncode != 0:
-        print(f"{module} failed:")
-        print(result.stdout.decode())
-        print(result.stderr.decode())
-        return False
-    print(f"{module} passed:")
-    print(result.stdout.decode())
-    print(result.stderr.decode())
-    return True
+    return f"ft_utils.tests.{f_head}"
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def run_test(*filenames, stream=False):
+    print(f"Running {', '.join(filenames)}...", flush=True)
+    modules = [_module_name(filename) for filename in filenames]
+    if len(modules) == 1:
+        command = [sys.executable, "-m", modules[0]]
+    else:
+        # One interpreter start up and ft_utils import for the whole batch.
+        command = [sys.executable, "-m", "unittest", *modules]
+    # stderr is merged so the output reads in the order it was written. When
+    # streaming it is passed straight through rather than held until the end.
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    ) as proc:
+        if stream:
+            for line in proc.stdout:
+                sys.stdout.write(line)
+            output = ""
+        else:
+            output = proc.stdout.read()
+    return ", ".join(modules), proc.returncode == 0, output
 
 
 def invoke_main():
+    parser = argparse.ArgumentParser(description="Run all ft_utils tests")
+    parser.add_argument(
+        "--parallel",
+        type=_positive_int,
+        default=1,
+        help="Number of test batches to run at once; benchmarks and timing sensitive "
+        "tests can be skewed when this is more than 1",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=4,
+        help="Number of unit test modules to run in one interpreter",
+    )
+    args = parser.parse_args()
     test_dir = os.path.dirname(__file__)
     test_files = [
         f
@@ -35,13 +68,39 @@ def invoke_main():
         if f.startswith("test_") or f.endswith("_bench.py")
     ]
     all_passed = True
+    tests = []
+    benchmarks = []
     for test_file in test_files:
         if "array" in test_file:
             continue  # These crash for now.
         if "test_run_all" in test_file:
             continue  # Recursion.
-        if not run_test(test_file):
-            all_passed = False
+        # Benchmarks do their work under __main__ so each needs its own run.
+        if test_file.endswith("_bench.py"):
+            benchmarks.append([test_file])
+        else:
+            tests.append(test_file)
+    batches = [
+        tests[i : i + args.batch_size] for i in range(0, len(tests), args.batch_size)
+    ]
+    # Each batch runs in its own interpreter, so threads which just wait on the
+    # subprocesses are enough to overlap them. Output from concurrent batches is
+    # printed here, one batch at a time, so it does not interleave; a single
+    # batch at a time can stream its output as it runs.
+    stream = args.parallel == 1
+    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+        futures = [
+            executor.submit(run_test, *batch, stream=stream)
+            for batch in batches + benchmarks
+        ]
+        for future in as_completed(futures):
+            modules, passed, output = future.result()
+            if passed:
+                print(f"{modules} passed:")
+            else:
+                print(f"{modules} failed:")
+                all_passed = False
+            print(output)
     if all_passed:
         print("TEST OK")
     else:
@@ -5,6 +5,7 @@
 import threading
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 from ft_utils.concurrency import AtomicFlag, AtomicInt64
 from ft_utils.lock_test_utils import run_interrupt_handling
@@ -12,16 +13,24 @@ from ft_utils.synchronization import RWLock, RWReadContext, RWWriteContext
 
 
 class TestRWLock(unittest.TestCase):
+    # The same ten threads serve every execute call rather than being started
+    # afresh for each test.
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ThreadPoolExecutor(max_workers=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
     def execute(self, what):
         def runnit():
             for _ in range(5):
                 what()
 
-        threads = [threading.Thread(target=runnit) for _ in range(10)]
-        for t in threads:
-            t.start()
-        for t in threads:
-            t.join()
+        futures = [self.pool.submit(runnit) for _ in range(10)]
+        for future in futures:
+            future.result()
 
     def test_simple_read_lock(self):
         lock = RWLock()
@@ -177,27 +186,35 @@ class TestRWLock(unittest.TestCase):
         self.assertTrue(rran)
         self.assertTrue(wran)
 
+    def wait_for_writer(self, lock, done):
+        # Nothing signals that a writer has blocked, so watch the lock itself.
+        deadline = time.monotonic() + 10
+        while lock.writers_waiting() == 0:
+            if time.monotonic() >= deadline:
+                # Release the readers so the test fails rather than hangs.
+                done.set()
+                self.fail("writer never queued")
+            time.sleep(0.001)
+
     def test_readers(self):
         lock = RWLock()
-        count = AtomicInt64()
-        done = AtomicFlag(False)
+        holding = threading.Barrier(11)
+        done = threading.Event()
 
         def read_wait():
             with RWReadContext(lock):
-                count.incr()
-                while not done:
-                    time.sleep(0.01)
+                holding.wait()
+                done.wait()
 
         threads = [threading.Thread(target=read_wait) for _ in range(10)]
 
         for t in threads:
             t.start()
-        while count < 10:
-            time.sleep(0.01)
+        holding.wait()
         readers = lock.readers()
         writers_waiting = lock.writers_waiting()
         writer_locked = lock.writer_locked()
-        done.set(True)
+        done.set()
 
         for t in threads:
             t.join()
@@ -208,25 +225,21 @@ class TestRWLock(unittest.TestCase):
 
     def test_writers_block_readers(self):
         lock = RWLock()
-        done = AtomicFlag(False)
-        locked = AtomicFlag(False)
-        new_start = AtomicInt64()
-        started = AtomicFlag(False)
+        done = threading.Event()
+        holding = threading.Barrier(6)
+        asking = threading.Barrier(6)
 
         def read_wait1():
             with RWReadContext(lock):
-                while not done:
-                    time.sleep(0.01)
+                holding.wait()
+                done.wait()
 
         def read_wait2():
-            new_start.incr()
+            asking.wait()
             with RWReadContext(lock):
-                while not done:
-                    time.sleep(0.01)
-                new_start.decr()
+                done.wait()
 
         def write_wait():
-            started.set(True)
             with RWWriteContext(lock):
                 pass
 
@@ -236,16 +249,14 @@ class TestRWLock(unittest.TestCase):
         for t in threads:
             t.start()
 
-        while lock.readers() < 5:
-            time.sleep(0.01)
+        holding.wait()
 
         # Ask for a write lock even though read is held.
         t = threading.Thread(target=write_wait)
         t.start()
         threads.append(t)
 
-        while not started:
-            time.sleep(0.01)
+        self.wait_for_writer(lock, done)
 
         # Now start 5 new read threads which should not get the read lock as the write waiting blocks.
         new_threads = [threading.Thread(target=read_wait2) for _ in range(5)]
@@ -254,16 +265,11 @@ class TestRWLock(unittest.TestCase):
             t.start()
             threads.append(t)
 
-        while new_start < 5:
-            time.sleep(0.01)
+        asking.wait()
         readers = lock.readers()
         locked = lock.writer_locked()
         waiting = lock.writers_waiting()
-        done.set(True)
-
-        # Drain the second set of readers.
-        while new_start > 0:
-            time.sleep(0.01)
+        done.set()
 
         for t in threads:
             t.join()
@@ -275,19 +281,18 @@ class TestRWLock(unittest.TestCase):
 
     def test_writers_waiting(self):
         lock = RWLock()
-        done = AtomicFlag(False)
-        started = AtomicFlag(False)
+        done = threading.Event()
+        holding = threading.Barrier(11)
         locked = AtomicFlag(False)
         unlocked = AtomicFlag(True)
 
         def read_wait():
             with RWReadContext(lock):
-                while not done:
-                    time.sleep(0.01)
+                holding.wait()
+                done.wait()
 
         def write_wait():
             unlocked.set(not lock.writer_locked())
-            started.set(True)
             with RWWriteContext(lock):
                 locked.set(lock.writer_locked())
 
@@ -296,19 +301,15 @@ class TestRWLock(unittest.TestCase):
         for t in threads:
             t.start()
 
-        while lock.readers() < 0:
-            time.sleep(0.01)
+        holding.wait()
 
         t = threading.Thread(target=write_wait)
         t.start()
         threads.append(t)
 
-        while lock.readers() < 10 or (not started):
-            time.sleep(0.01)
-
-        time.sleep(0.1)
+        self.wait_for_writer(lock, done)
         writers_waiting = lock.writers_waiting()
-        done.set(True)
+        done.set()
 
         for t in threads:
             t.join()
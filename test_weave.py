@@ -23,6 +23,21 @@ from ft_utils._test_weave import (  # @manual
 
 @unittest.skipIf(sys.version_info < (3, 13), "Requires Python 3.13 or later")
 class TestTLSManagement(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Register and unregister once from a thread so the native import of
+        # ft_utils.weave and the lazy TLS set up happen here rather than in
+        # whichever test runs first. setUp resets the counters afterwards.
+        ft_utils.ENABLE_EXPERIMENTAL = True
+
+        def warm_up():
+            register_destructor_1()
+            unregister_destructor_1()
+
+        t = threading.Thread(target=warm_up)
+        t.start()
+        t.join()
+
     def setUp(self):
         ft_utils.ENABLE_EXPERIMENTAL = True
         reset()
@@ -1,84 +1,59 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 
 import argparse
+import itertools
 import random
 import sys
 import threading
 import time
 from collections.abc import Callable
-from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
+from ft_utils.concurrency import AtomicReference
+
 # pyre-strict
 
 
 def setup() -> None:
-    global NUM_THREADS, CITIES, MAX_COST, NUM_RUNS
+    global NUM_THREADS, CITIES, MAX_COST, NUM_RUNS, PER_RUN_TIMEOUT
     parser = argparse.ArgumentParser(description="TSP Solver")
     parser.add_argument("--num_threads", type=int, default=8, help="Number of threads")
     parser.add_argument("--num_runs", type=int, default=5, help="Number of runs")
     parser.add_argument("--cities", type=int, default=8, help="Number of cities")
+    parser.add_argument(
+        "--per_run_timeout", type=float, default=60.0, help="Seconds allowed per run"
+    )
     args: argparse.Namespace = parser.parse_args()
     NUM_THREADS = args.num_threads  # pyre-ignore[10]
     NUM_RUNS = args.num_runs  # pyre-ignore[10]
     CITIES = args.cities  # pyre-ignore[10]
+    PER_RUN_TIMEOUT = args.per_run_timeout  # pyre-ignore[10]
     MAX_COST = sys.maxsize  # pyre-ignore[10]
     if NUM_THREADS > CITIES:
         raise ValueError("num_threads > cities will produce misleading results")
     print(f"TSP run for ncities={CITIES}, nthreads={NUM_THREADS}")
 
 
-def swap(array: list[int], pos1: int, pos2: int) -> None:
-    array[pos1], array[pos2] = array[pos2], array[pos1]
-
-
-def calculate_cost_bf(perm: list[int], matrix: list[list[int]]) -> int:
-    cost = 0
-    for i in range(CITIES - 1):
-        cost += matrix[perm[i]][perm[i + 1]]
-    cost += matrix[perm[CITIES - 1]][perm[0]]  # Returning to the start city
-    return cost
-
-
-def permute(
-    array: list[int],
-    start: int,
-    end: int,
-    matrix: list[list[int]],
-    min_cost: list[int],
-) -> None:
-    if start == end:
-        current_cost = calculate_cost_bf(array, matrix)
-        if current_cost < min_cost[0]:
-            min_cost[0] = current_cost
-        return
-    for i in range(start, end + 1):
-        swap(array, start, i)
-        permute(array, start + 1, end, matrix, min_cost)
-        swap(array, start, i)  # backtrack
-
-
 def brute_force_tsp(matrix: list[list[int]]) -> int:
-    min_cost = [MAX_COST]
-    cities = list(range(CITIES))
-    permute(cities, 0, CITIES - 1, matrix, min_cost)
-    return min_cost[0]
+    # A tour is a cycle so fixing city 0 as the start still covers every tour.
+    min_cost = MAX_COST
+    start_row = matrix[0]
+    for rest in itertools.permutations(range(1, CITIES)):
+        row = start_row
+        cost = 0
+        for city in rest:
+            cost += row[city]
+            row = matrix[city]
+        cost += row[0]  # Returning to the start city
+        if cost < min_cost:
+            min_cost = cost
+    return min_cost
 
 
 class SharedData:
     def __init__(self) -> None:
         self.city_matrix: list[list[int]] = [[0] * CITIES for _ in range(CITIES)]
-        self.best_cost: int = MAX_COST
-        self.lock: threading.Lock = threading.Lock()
-
-
-def calculate_cost(path: list[int], matrix: list[list[int]]) -> int:
-    cost = 0
-    num_cities = len(path)
-    for i in range(num_cities - 1):
-        cost += matrix[path[i]][path[i + 1]]
-    cost += matrix[path[num_cities - 1]][path[0]]
-    return cost
+        self.best_cost: AtomicReference[int] = AtomicReference(MAX_COST)
 
 
 def branch_and_bound(
@@ -87,12 +62,14 @@ def branch_and_bound(
     barrier.wait()
     visited = [False] * CITIES
     current_path = [0] * (CITIES + 1)
-    # Rotate cities so that start_city is at the beginning
-    cities = list(range(CITIES))
-    cities = cities[start_city:] + cities[:start_city]
-    visited[0] = True
-    current_path[0] = cities[0]
-    solve_tsp(data, visited, current_path, 1, cities)
+    # For each city, every city ordered nearest first. The search visits cities
+    # in this order so only the start differs between threads.
+    nearest = tuple(
+        tuple(sorted(range(CITIES), key=row.__getitem__)) for row in data.city_matrix
+    )
+    visited[start_city] = True
+    current_path[0] = start_city
+    solve_tsp(data, visited, current_path, 1, 0, nearest)
 
 
 def solve_tsp(
@@ -100,27 +77,46 @@ def solve_tsp(
     visited: list[bool],
     current_path: list[int],
     level: int,
-    cities: list[int],
+    cost: int,
+    nearest: tuple[tuple[int, ...], ...],
 ) -> None:
+    # cost is that of the partial path, so each step adds a single edge rather
+    # than the whole tour being summed again at every leaf.
+    last = current_path[level - 1]
+    row = data.city_matrix[last]
+    best_cost = data.best_cost
     if level == CITIES:
-        cost = calculate_cost(current_path, data.city_matrix)
-        if cost < data.best_cost:
-            with data.lock:
-                if cost < data.best_cost:
-                    data.best_cost = cost
+        cost += row[current_path[0]]
+        # compare_exchange matches on identity so it only succeeds against the
+        # exact int read, retrying if another thread got in first.
+        while cost < (best := best_cost.get()):
+            if best_cost.compare_exchange(best, cost):
+                break
         return
-    for i in range(CITIES):
-        if not visited[i]:
-            visited[i] = True
-            current_path[level] = cities[i]
-            solve_tsp(data, visited, current_path, level + 1, cities)
-            visited[i] = False
+    # The best cost only ever falls, so a value read here which another thread
+    # has since beaten prunes less but never wrongly.
+    best = best_cost.get()
+    for city in nearest[last]:
+        if not visited[city]:
+            next_cost = cost + row[city]
+            if next_cost >= best:
+                # Edges are never negative so this path cannot beat the best
+                # tour, and the remaining neighbours are no nearer.
+                break
+            visited[city] = True
+            current_path[level] = city
+            solve_tsp(data, visited, current_path, level + 1, next_cost, nearest)
+            visited[city] = False
+            best = best_cost.get()
 
 
 def generate_matrix(matrix: list[list[int]]) -> None:
+    # One random.choices call per row is far cheaper than a randint per cell.
+    costs = range(1, 101)
     for i in range(CITIES):
-        for j in range(CITIES):
-            matrix[i][j] = 0 if i == j else random.randint(1, 100)
+        row = random.choices(costs, k=CITIES)
+        row[i] = 0
+        matrix[i][:] = row
 
 
 class ExceptionWrapper:
@@ -139,30 +135,30 @@ def run_test(test_number: int, matrix: list[list[int]]) -> None:
     data = SharedData()
     data.city_matrix = matrix
     start = time.time()
-    futures = []
-    with ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-        barrier = threading.Barrier(NUM_THREADS)
-        for i in range(NUM_THREADS):
-            wrapper = ExceptionWrapper(branch_and_bound)
-            future = executor.submit(wrapper, data, i, barrier)
-            futures.append((future, wrapper))
-
-    def check_except(future: Future, wrapper: ExceptionWrapper) -> None:
-        if future.exception() is not None:
-            print(f"Exception occurred in thread {future}: {future.exception()}")
-        elif wrapper.exception is not None:
+    workers = []
+    barrier = threading.Barrier(NUM_THREADS)
+    for i in range(NUM_THREADS):
+        wrapper = ExceptionWrapper(branch_and_bound)
+        # Daemon threads so a stuck worker cannot keep the process alive once
+        # the run has timed out.
+        thread = threading.Thread(target=wrapper, args=(data, i, barrier), daemon=True)
+        thread.start()
+        workers.append((thread, wrapper))
+
+    deadline = start + PER_RUN_TIMEOUT
+    for thread, wrapper in workers:
+        thread.join(max(0.0, deadline - time.time()))
+        if thread.is_alive():
+            print(f"Test {test_number}: timed out after {PER_RUN_TIMEOUT} seconds")
+            exit(1)
+        if wrapper.exception is not None:
             print(
                 f"Exception occurred in function {wrapper.func.__name__}: {wrapper.exception}"
             )
-        else:
-            return
-        exit(1)
-
-    for future, wrapper in futures:
-        check_except(future, wrapper)
+            exit(1)
 
     end = time.time()
-    print(f"Test {test_number}: {end - start} seconds, cost: {data.best_cost}")
+    print(f"Test {test_number}: {end - start} seconds, cost: {data.best_cost.get()}")
 
 
 def invoke_main() -> None:
@@ -6,33 +6,34 @@ import sys
 
 import ft_utils._weave  # @manual
 
+_REQUIRED_VERSION = (3, 13)
+# The interpreter version cannot change so it is only compared once, on import.
+_VERSION_SUPPORTED: bool = sys.version_info >= _REQUIRED_VERSION
+
 
 def _check_enabled(version: bool = True, experimental: bool = True) -> None:
     if experimental:
         if not ft_utils.ENABLE_EXPERIMENTAL:
             raise RuntimeError("Experimental support not enabled for ft_utils")
-    required_version = (3, 13)
-    current_version = sys.version_info
-
-    if current_version < required_version:
+    if version and not _VERSION_SUPPORTED:
         raise RuntimeError(
-            f"Python version {current_version}; >={required_version[0]}.{required_version[1]} is required"
+            f"Python version {sys.version_info}; >={_REQUIRED_VERSION[0]}.{_REQUIRED_VERSION[1]} is required"
         )
 
 
+# The functions below check ft_utils.ENABLE_EXPERIMENTAL on their first call, as
+# it may be set after import, then replace themselves with the native versions.
 def register_native_destructor(var: int, destructor: int) -> None:
     """Register a native C ABI destructor for native thread local storage."""
+    global register_native_destructor
     _check_enabled()
-    sys.modules[
-        __name__
-    ].register_native_destructor = ft_utils._weave.register_native_destructor
+    register_native_destructor = ft_utils._weave.register_native_destructor
     return register_native_destructor(var, destructor)
 
 
 def unregister_native_destructor(var: int) -> bool:
     """Unregister any already registered destructors for the storage pointed to by the argument and return if any unregistered."""
+    global unregister_native_destructor
     _check_enabled()
-    sys.modules[
-        __name__
-    ].unregister_native_destructor = ft_utils._weave.unregister_native_destructor
+    unregister_native_destructor = ft_utils._weave.unregister_native_destructor
     return unregister_native_destructor(var)